@@ -1,9 +1,16 @@
 import sys
+import multiprocessing
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
 from pdf_processor import PDFProcessor
+from ocr_engine import prewarm_ocr_engine
 
 if __name__ == "__main__":
+    # Required for the page classification worker processes in the frozen (PyInstaller) executable
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     ex = PDFProcessor()
     ex.show()
+    # Load the OCR models in the background once the window is up
+    QTimer.singleShot(0, prewarm_ocr_engine)
     sys.exit(app.exec_())
@@ -0,0 +1,124 @@
+"""Compares OCR of scanned schedule tables, reported as cells per second and cells read correctly.
+
+text       the previous approach: image_to_string over the table region, the lines mentioning a schedule
+           split on whitespace (for this set, only the title line)
+cells      page_schedule_tables, one image_to_data call per batch of rows, words placed in grid cells
+threaded   the same with --threads batches OCR'd at once
+
+A scanned sheet of --large-rows rows then goes through iter_table_rows, one batch at a time, to compare the
+peak memory of the streaming mode with rendering the whole table for OCR at once. Needs Tesseract.
+
+Usage:
+    python benchmarks/cell_ocr_benchmark.py [--pages 4] [--rows 12] [--threads 4] [--large-rows 50]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+
+import pytesseract
+
+import pdf_processing_image
+from synthetic_sets import make_schedule_pages
+
+COLUMNS = ["TAG", "DESCRIPTION", "CFM", "ESP", "HP", "VOLTS"]
+
+
+def expected_cells(rows):
+    """The cell values make_schedule_pages draws, header row first."""
+    return [COLUMNS] + [[f"AHU-{row + 1}", "AIR HANDLING UNIT", str(1000 + row * 250), "1.5", "5", "460"]
+                        for row in range(rows)]
+
+
+def text_tables(page, page_num, threads):
+    tables = []
+    for region in pdf_processing_image.page_table_regions(page):
+        clip = (region + (0, -pdf_processing_image.TABLE_TITLE_BAND, 0, 0)) & page.rect
+        text = pytesseract.image_to_string(pdf_processing_image.render_page_image(page, clip=clip))
+        lines = [line.split() for line in text.split("\n") if pdf_processing_image.contains_schedule_title(line)]
+        if lines:
+            tables.append((lines, f"Table 1 on Page {page_num + 1}"))
+    return tables
+
+
+def cell_tables(page, page_num, threads):
+    return [(table.values.tolist(), title) for table, title in
+            pdf_processing_image.page_schedule_tables(page, page_num, threads=threads)]
+
+
+def score(tables, expected):
+    """Returns (cells, correct cells) of extracted tables against the expected cell values."""
+    cells = correct = 0
+    for rows, _ in tables:
+        cells += sum(len(row) for row in rows)
+        correct += sum(value == want for row, want_row in zip(rows, expected)
+                       for value, want in zip(row, want_row))
+    return cells, correct
+
+
+def measure(method, document, rows, threads):
+    start = time.perf_counter()
+    tables = [table for page_num, page in enumerate(document) for table in method(page, page_num, threads)]
+    elapsed = time.perf_counter() - start
+    cells, correct = score(tables, expected_cells(rows))
+    grid_cells = len(document) * (rows + 1) * len(COLUMNS)
+    return {
+        "seconds": round(elapsed, 3),
+        "tables": len(tables),
+        "cells_per_second": round(grid_cells / elapsed, 1),
+        "cells_extracted": cells,
+        "cells_correct": round(correct / grid_cells, 3),
+    }
+
+
+def peak_memory(function):
+    tracemalloc.start()
+    try:
+        function()
+        return round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def measure_streaming(rows):
+    page = make_schedule_pages(1, scanned=True, rows=rows)[0]
+    grid = pdf_processing_image.page_table_grids(page)[0]
+
+    def stream():
+        return sum(len(batch) for batch in pdf_processing_image.iter_table_rows(page, grid, threads=1))
+
+    def whole_render():
+        pdf_processing_image.render_page_image(page, pdf_processing_image.CELL_OCR_ZOOM,
+                                               pdf_processing_image.grid_rect(grid))
+
+    return {"rows": rows, "streaming_peak_mb": peak_memory(stream), "whole_table_render_mb": peak_memory(whole_render)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=12, help="Rows per schedule, below the header row")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--large-rows", type=int, default=50,
+                        help="Rows of the sheet used for the memory check, at most 54 fit on it")
+    args = parser.parse_args()
+
+    document = make_schedule_pages(args.pages, scanned=True, rows=args.rows)
+    results = {
+        "text": measure(text_tables, document, args.rows, 1),
+        "cells": measure(cell_tables, document, args.rows, 1),
+        "threaded": measure(cell_tables, document, args.rows, args.threads),
+    }
+    results["streaming"] = measure_streaming(args.large_rows)
+    print(json.dumps({"pages": args.pages, "rows": args.rows, "threads": args.threads, "results": results},
+                     indent=2))
+
+
+if __name__ == "__main__":
+    main()
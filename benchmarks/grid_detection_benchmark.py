@@ -0,0 +1,88 @@
+"""Compares table detection on scanned and vector pages, reported as false positives and time per page.
+
+contour  the previous detector: Otsu threshold of the 72 dpi render, a table as soon as any external
+         contour is larger than 50x50 pixels; a hit sends the whole page to OCR
+grid     detect_table_regions on a downsampled render: ruling lines by morphological opening, a table when
+         its lines cross at least MIN_GRID_JOINTS times; only the table regions go to OCR
+
+Positives are schedule pages, negatives are drawing sheets (border and title block) and spec pages, each
+half vector, half scanned. ocr_area_share is the share of the page area that would be OCR'd, over all pages.
+
+Usage:
+    python benchmarks/grid_detection_benchmark.py [--pages 20] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+
+import cv2
+
+import pdf_processing_image
+from synthetic_sets import make_plan_set, make_schedule_pages, make_spec_set
+
+
+def contour_regions(page):
+    image = pdf_processing_image.render_page_image(page)
+    blur = cv2.GaussianBlur(image, (5, 5), 0)
+    _, thresh = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if w > 50 and h > 50:
+            return [page.rect]
+    return []
+
+
+def grid_regions(page):
+    return pdf_processing_image.page_table_regions(page)
+
+
+def make_pages(pages):
+    half = max(1, pages // 2)
+    positives = [make_schedule_pages(half), make_schedule_pages(half, scanned=True)]
+    negatives = [make_plan_set(half, scanned_every=0), make_plan_set(half, scanned_every=1),
+                 make_spec_set(half), make_spec_set(half, scanned_every=1)]
+    return ([page for document in positives for page in document],
+            [page for document in negatives for page in document])
+
+
+def measure(detector, positives, negatives, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = [detector(page) for page in positives + negatives]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    pages = positives + negatives
+    hits = [bool(regions) for regions in found]
+    ocr_area = sum(abs(region) for regions in found for region in regions)
+    return {
+        "ms_per_page": round(best / len(pages) * 1000, 2),
+        "missed": hits[:len(positives)].count(False),
+        "false_positives": hits[len(positives):].count(True),
+        "false_positive_rate": round(hits[len(positives):].count(True) / len(negatives), 3),
+        "ocr_area_share": round(ocr_area / sum(abs(page.rect) for page in pages), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20, help="Pages per kind, half of them scanned")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per detector, the fastest one is reported")
+    args = parser.parse_args()
+
+    positives, negatives = make_pages(args.pages)
+    results = {name: measure(detector, positives, negatives, args.repeat)
+               for name, detector in (("contour", contour_regions), ("grid", grid_regions))}
+    print(json.dumps({"positives": len(positives), "negatives": len(negatives), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Measures the logging overhead per page of title block classification.
+
+Pages come from a vector drawing set (title blocks read from the text layer, no OCR) so logging is a visible
+share of the per-page time. classify_pages runs once per logging setup:
+
+    silent       root level WARNING, the per-page INFO lines are dropped before they are formatted
+    sync         INFO through a StreamHandler on the classifying thread, i.e. logging.basicConfig
+    queue        INFO through logging_config's queue, written by the listener thread
+    queue_debug  DEBUG through the queue, adds the per-token and per-attempt lines
+
+The overhead is the time per page above "silent". For the queue setups, drain_seconds is the time the
+listener still needed to write the queued records once classification was done.
+
+Usage:
+    python benchmarks/logging_benchmark.py [--pages 400] [--repeat 3] [--target file|stderr]
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import sys
+import tempfile
+import time
+from logging.handlers import QueueListener
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+
+import logging_config
+import pdf_processing
+from synthetic_sets import make_plan_set
+
+SETUPS = ("silent", "sync", "queue", "queue_debug")
+
+
+class CountingFilter(logging.Filter):
+    def __init__(self):
+        super().__init__()
+        self.records = 0
+
+    def filter(self, record):
+        self.records += 1
+        return True
+
+
+def install(setup, stream):
+    """Points the root logger at stream for setup, returns (stop function, record counter)."""
+    root = logging.getLogger()
+    root.handlers.clear()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(logging.Formatter(logging_config.LOG_FORMAT))
+    counter = CountingFilter()
+    output.addFilter(counter)
+
+    if setup in ("silent", "sync"):
+        root.addHandler(output)
+        root.setLevel(logging.WARNING if setup == "silent" else logging.INFO)
+        return lambda: None, counter
+
+    handler = logging_config.DeferredQueueHandler(queue.SimpleQueue())
+    listener = QueueListener(handler.queue, output)
+    listener.start()
+    root.addHandler(handler)
+    root.setLevel(logging.DEBUG if setup == "queue_debug" else logging.INFO)
+    return listener.stop, counter
+
+
+def run(setup, document, target, folder):
+    if target == "stderr":
+        stream = sys.stderr
+    else:
+        stream = open(os.path.join(folder, f"{setup}.log"), "w")
+    try:
+        stop, counter = install(setup, stream)
+        start = time.perf_counter()
+        pdf_processing.classify_pages(document, "PLANS", folder, ocr_mode="text_layer")
+        elapsed = time.perf_counter() - start
+        drain_start = time.perf_counter()
+        stop()
+        drain = time.perf_counter() - drain_start
+    finally:
+        logging.getLogger().handlers.clear()
+        if stream is not sys.stderr:
+            stream.close()
+    return elapsed, drain, counter.records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per setup, the fastest one is reported")
+    parser.add_argument("--target", choices=("file", "stderr"), default="file",
+                        help="Where log lines are written; stderr includes the console's own cost")
+    args = parser.parse_args()
+
+    pdf_processing.OCR_CACHE_ENABLED = False
+    # The import configured queue logging already, each setup installs its own handlers instead
+    logging_config.stop_logging()
+    document = make_plan_set(args.pages, scanned_every=0)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for setup in SETUPS:
+            best = min((run(setup, document, args.target, folder) for _ in range(args.repeat)),
+                       key=lambda outcome: outcome[0])
+            seconds, drain, records = best
+            results[setup] = {
+                "seconds": round(seconds, 4),
+                "us_per_page": round(seconds / args.pages * 1e6, 1),
+                "drain_seconds": round(drain, 4),
+                "lines_per_page": round(records / args.pages, 2),
+            }
+    for setup in SETUPS:
+        results[setup]["overhead_us_per_page"] = round(results[setup]["us_per_page"]
+                                                       - results["silent"]["us_per_page"], 1)
+    print(json.dumps({"pages": args.pages, "target": args.target, "setups": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Compares the title block OCR backends (text layer, Tesseract, EasyOCR and the Tesseract -> EasyOCR cascade).
+
+Every page of a drawing set (or --input) is classified by each backend on its own: the text layer from the
+page's text, the OCR backends from the rendered title block with the text layer ignored. Reports throughput
+per backend and how often each backend's match decision agrees with the others. Every --scanned-every-th
+sheet of the synthetic set is scanned (0 = all vector), its "expected" decisions come from the sheet numbers
+it was drawn with; on a CAD-exported --input the text layer is the reference. The OCR cache is not used.
+
+Backends whose engine is not installed (Tesseract binary, EasyOCR models) are reported as unavailable.
+
+Usage:
+    python benchmarks/ocr_backend_benchmark.py [--pages 60] [--scanned-every 2] [--input drawings.pdf] [--zoom 2]
+                                               [--layout]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+
+import pymupdf
+
+import pdf_processing
+from ocr_backends import get_ocr_backend
+from synthetic_sets import make_plan_set, plan_sheet_number
+
+
+def classify_text_layer(fitz_page, box):
+    return pdf_processing.title_block_matches(pdf_processing.text_layer_lines(fitz_page, box), "PLANS")
+
+
+def classify_ocr(image, backends, tight):
+    # backends are tried in order like a cascade, a single backend is a one-element cascade
+    for backend in backends:
+        ocr_results = backend.for_box(tight).recognize(image)
+        if pdf_processing.ocr_is_confident(ocr_results, "PLANS"):
+            break
+    return pdf_processing.title_block_matches([text for text, _ in ocr_results], "PLANS")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--scanned-every", type=int, default=2, help="Every Nth synthetic sheet is scanned")
+    parser.add_argument("--input", help="Benchmark an existing PDF instead of a synthetic one")
+    parser.add_argument("--zoom", type=float, default=pdf_processing.TITLE_BLOCK_ZOOM)
+    parser.add_argument("--layout", action="store_true", help="OCR the probed (tight) title block box")
+    args = parser.parse_args()
+
+    if args.input:
+        document = pymupdf.open(args.input)
+    else:
+        document = make_plan_set(args.pages, scanned_every=args.scanned_every, small_number_every=4)
+    layout = pdf_processing.detect_title_block_layout(document, "PLANS", "text_layer") if args.layout else None
+
+    boxes = []
+    images = []
+    for page_num in range(document.page_count):
+        fitz_page = document.load_page(page_num)
+        box = pdf_processing.title_block_box(fitz_page, "PLANS")
+        boxes.append(box)
+        pix = pdf_processing.render_title_block(fitz_page, pdf_processing.title_block_box(fitz_page, "PLANS", layout),
+                                                args.zoom)
+        images.append(pdf_processing.preprocess_image(pdf_processing.pixmap_to_array(pix)).copy())
+
+    tiers = {
+        "text_layer": None,
+        "tesseract": ["tesseract"],
+        "easyocr": ["easyocr"],
+        "cascade": ["tesseract", "easyocr"],
+    }
+    results = {"pages": document.page_count, "zoom": args.zoom, "layout": layout, "backends": {}}
+    decisions = {}
+    if not args.input:
+        decisions["expected"] = [plan_sheet_number(page_num).startswith("M") for page_num in range(document.page_count)]
+    for name, backend_names in tiers.items():
+        if backend_names is None:
+            start = time.perf_counter()
+            decisions[name] = [classify_text_layer(document.load_page(page_num), box)
+                               for page_num, box in enumerate(boxes)]
+        else:
+            backends = [get_ocr_backend(backend_name) for backend_name in backend_names]
+            if not all(backend.is_available() for backend in backends):
+                results["backends"][name] = {"unavailable": True}
+                continue
+            if "easyocr" in backend_names:
+                # Model loading is not part of the measurement
+                get_ocr_backend("easyocr").recognize(images[0])
+            start = time.perf_counter()
+            decisions[name] = [classify_ocr(image, backends, layout is not None) for image in images]
+        elapsed = time.perf_counter() - start
+        results["backends"][name] = {
+            "seconds": elapsed,
+            "pages_per_second": document.page_count / elapsed if elapsed else None,
+            "matches": sum(decisions[name]),
+        }
+
+    results["agreement"] = {
+        f"{first}/{second}": sum(a == b for a, b in zip(decisions[first], decisions[second])) / document.page_count
+        for index, first in enumerate(decisions) for second in list(decisions)[index + 1:]
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
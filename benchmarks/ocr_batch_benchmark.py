@@ -0,0 +1,58 @@
+"""Measures PLANS classification throughput on CPU for several OCR batch sizes.
+
+Generates a scanned (image-only) drawing set so every page needs OCR, disables the OCR cache, and runs
+classify_pages with each batch size. Batch size 1 is equivalent to the previous one-readtext-per-page path.
+Also reports how many title blocks were settled at the first (lowest) zoom and the pixels rendered per page.
+Requires the EasyOCR models to be available (they are downloaded on first use).
+
+Usage:
+    python benchmarks/ocr_batch_benchmark.py [--pages 64] [--batch-sizes 1,4,8,16]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+
+import pdf_processing
+from ocr_engine import get_easyocr_reader
+from synthetic_sets import make_plan_set
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=64)
+    parser.add_argument("--batch-sizes", default="1,4,8,16")
+    args = parser.parse_args()
+
+    pdf_processing.OCR_CACHE_ENABLED = False
+    document = make_plan_set(args.pages, scanned_every=1)
+    get_easyocr_reader()  # model loading is not part of the measurement
+
+    results = {"pages": args.pages, "batch_sizes": {}}
+    baseline = None
+    for batch_size in (int(value) for value in args.batch_sizes.split(",")):
+        stats_before = Counter(pdf_processing.title_block_source_stats)
+        start = time.perf_counter()
+        matches = pdf_processing.classify_pages(document, "PLANS", "", batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        stats = pdf_processing.title_block_source_stats - stats_before
+        baseline = baseline if baseline is not None else matches
+        results["batch_sizes"][batch_size] = {
+            "seconds": elapsed,
+            "pages_per_second": args.pages / elapsed,
+            "matches": sum(matches),
+            "agrees_with_first": matches == baseline,
+            "first_pass_hit_rate": stats["ocr_first_pass"] / stats["ocr"] if stats["ocr"] else None,
+            "pixels_per_page": stats["rendered_pixels"] / args.pages,
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Compares assembling the filtered PDF with PyPDF2 (PdfReader + PdfWriter.add_page) against PyMuPDF (save_pages).
+
+All methods open the input, count its pages and write every other page to a new file, which is what
+create_filtered_pdf does around classification. "partial" additionally streams the matched pages to the
+partial output in chunks (PartialPdfWriter) before writing the final file, as create_filtered_pdf does
+with PARTIAL_OUTPUT_ENABLED. Each method runs in a fresh interpreter so peak RSS is not shared between them.
+
+--page-image-kb adds an incompressible raster of that size to every page, e.g. 1100 KB on 900 pages gives
+a ~1 GB input like a scanned drawing set.
+
+Usage:
+    python benchmarks/output_assembly_benchmark.py [--pages 500] [--page-image-kb 0] [--input existing.pdf]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+
+
+def run_pypdf2(input_path, output_path):
+    from PyPDF2 import PdfReader, PdfWriter
+    reader = PdfReader(input_path)
+    writer = PdfWriter()
+    for page_num in range(0, len(reader.pages), 2):
+        writer.add_page(reader.pages[page_num])
+    with open(output_path, 'wb') as out_pdf:
+        writer.write(out_pdf)
+
+
+def run_pymupdf(input_path, output_path):
+    import pymupdf
+    from pdf_processing import save_pages
+    document = pymupdf.open(input_path)
+    save_pages(document, list(range(0, document.page_count, 2)), output_path)
+
+
+def run_partial(input_path, output_path):
+    import pymupdf
+    from output_writer import PartialPdfWriter
+    from pdf_processing import save_pages
+    document = pymupdf.open(input_path)
+    partial_output = PartialPdfWriter(document, output_path)
+    for page_num in range(document.page_count):
+        partial_output.add({page_num: page_num % 2 == 0})
+    partial_output.flush()
+    save_pages(document, list(range(0, document.page_count, 2)), output_path)
+    partial_output.discard()
+
+
+def child(method, input_path, output_path):
+    start = time.perf_counter()
+    {"pypdf2": run_pypdf2, "pymupdf": run_pymupdf, "partial": run_partial}[method](input_path, output_path)
+    elapsed = time.perf_counter() - start
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        rss_mb = rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+    except ImportError:
+        rss_mb = None
+    print(json.dumps({"seconds": elapsed, "peak_rss_mb": rss_mb, "output_bytes": os.path.getsize(output_path)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--page-image-kb", type=int, default=0, help="Incompressible raster added to every page")
+    parser.add_argument("--input", help="Benchmark an existing PDF instead of a synthetic one")
+    parser.add_argument("--child", nargs=3, metavar=("METHOD", "INPUT", "OUTPUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = args.input
+        if not input_path:
+            from synthetic_sets import make_plan_set
+            input_path = os.path.join(tmp, "input.pdf")
+            make_plan_set(args.pages, scanned_every=0, lines=200, logo=True, page_image_kb=args.page_image_kb,
+                          path=input_path)
+
+        results = {"input_bytes": os.path.getsize(input_path)}
+        for method in ("pypdf2", "pymupdf", "partial"):
+            output = subprocess.check_output([sys.executable, __file__, "--child", method, input_path,
+                                              os.path.join(tmp, f"{method}.pdf")], cwd=REPO_ROOT)
+            results[method] = json.loads(output.decode().strip().splitlines()[-1])
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""End-to-end benchmark of the extraction pipelines on synthetic documents, with per-stage timings.
+
+Pipelines:
+    plans       create_filtered_pdf on a drawing set mixing vector and scanned title blocks (M-xxx sheets)
+    specs       create_pdf_between_indices on a spec book with '23 xx xx' section footers
+    image_page  extract_schedule_tables on scanned schedule pages
+    text_page   process_text_based_page on vector schedule pages (needs camelot)
+
+Stages (render, preprocess, OCR, write, ...) are timed by wrapping the functions that implement them, each
+stage counting only its own time (a stage nested in another is not counted twice). Document generation is
+not part of the measurement. The OCR cache and checkpoint journals are disabled so runs are comparable.
+
+Results are printed as JSON (and written to --output); --compare adds the speedup against an earlier
+results file, per pipeline and per stage.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py [--pipelines plans,specs] [--plan-pages 60] [--spec-pages 200]
+                                            [--ocr-mode easyocr] [--output run.json] [--compare baseline.json]
+"""
+import argparse
+import functools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import pymupdf
+
+import ocr_backends
+import output_writer
+import pdf_processing
+from synthetic_sets import make_plan_set, make_schedule_pages, make_spec_set, plan_sheet_number, section_page_range
+
+PIPELINES = ("plans", "specs", "image_page", "text_page")
+
+
+class StageTimer:
+    """Accumulates exclusive wall time and call counts per stage for the wrapped functions."""
+
+    def __init__(self):
+        self.stages = {}
+        self._stack = []  # [stage, time spent in nested stages]
+
+    def reset(self):
+        self.stages = {}
+
+    def wrap(self, owner, name, stage):
+        func = getattr(owner, name)
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            nested_same_stage = any(entry[0] == stage for entry in self._stack)
+            self._stack.append([stage, 0.0])
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                _, nested = self._stack.pop()
+                if self._stack:
+                    self._stack[-1][1] += elapsed
+                totals = self.stages.setdefault(stage, {"calls": 0, "seconds": 0.0})
+                totals["seconds"] += elapsed - nested
+                if not nested_same_stage:
+                    totals["calls"] += 1
+
+        setattr(owner, name, timed)
+
+
+def instrument(timer):
+    timer.wrap(pdf_processing, "render_title_block", "render")
+    timer.wrap(pdf_processing, "preprocess_image", "preprocess")
+    timer.wrap(pdf_processing, "text_layer_lines", "text_layer")
+    timer.wrap(pdf_processing, "detect_title_block_layout", "layout_probe")
+    for backend_class in (ocr_backends.EasyOcrBackend, ocr_backends.TesseractBackend):
+        timer.wrap(backend_class, "recognize", "ocr")
+        timer.wrap(backend_class, "recognize_batch", "ocr")
+    timer.wrap(pdf_processing, "save_pages", "write")
+    timer.wrap(output_writer.PartialPdfWriter, "flush", "write")
+
+
+def output_folder(folder):
+    # The filtered PDF keeps the input's file name, it must not land next to the input
+    path = os.path.join(folder, "output")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def run_plans(args, folder):
+    path = os.path.join(folder, "plans.pdf")
+    make_plan_set(args.plan_pages, args.scanned_every).save(path)
+    expected = sum(plan_sheet_number(page_num).startswith("M") for page_num in range(args.plan_pages))
+
+    def run():
+        output = pdf_processing.create_filtered_pdf(path, "PLANS", None, workers=args.workers,
+                                                    batch_size=args.batch_size, output_folder=output_folder(folder),
+                                                    ocr_mode=args.ocr_mode)
+        return {"output_pages": pymupdf.open(output).page_count, "expected_pages": expected}
+
+    return args.plan_pages, run
+
+
+def run_specs(args, folder):
+    path = os.path.join(folder, "specs.pdf")
+    make_spec_set(args.spec_pages, args.spec_scanned_every).save(path)
+    first, last = section_page_range(args.spec_pages)
+
+    def run():
+        output = pdf_processing.create_pdf_between_indices(path, None, output_folder=output_folder(folder),
+                                                           ocr_mode=args.ocr_mode)
+        # The located range also includes the boundary page on each side of division 23
+        return {"output_pages": pymupdf.open(output).page_count if output else 0,
+                "division_pages": last - first + 1}
+
+    return args.spec_pages, run
+
+
+def run_image_page(args, folder, timer):
+    import pdf_processing_image
+    # Cell batches are OCR'd on threads the timer cannot follow, their time is counted for the whole page
+    timer.wrap(pdf_processing_image, "page_schedule_tables", "cell_ocr")
+    timer.wrap(pdf_processing_image, "page_table_grids", "detect")
+    timer.wrap(pdf_processing_image, "ocr_image", "ocr")
+    path = os.path.join(folder, "schedules_scanned.pdf")
+    make_schedule_pages(args.schedule_pages, scanned=True).save(path)
+
+    def run():
+        return {"tables": sum(1 for _ in pdf_processing_image.extract_schedule_tables(path, workers=args.workers))}
+
+    return args.schedule_pages, run
+
+
+def run_text_page(args, folder, timer):
+    import camelot
+    import pdf_processing_text
+    timer.wrap(camelot, "read_pdf", "table_extraction")
+    path = os.path.join(folder, "schedules_vector.pdf")
+    make_schedule_pages(args.schedule_pages).save(path)
+
+    def run():
+        tables = [pdf_processing_text.process_text_based_page(path, page_num)[0]
+                  for page_num in range(args.schedule_pages)]
+        return {"tables": sum(len(page_tables) for page_tables in tables)}
+
+    return args.schedule_pages, run
+
+
+def benchmark_pipeline(name, args, timer):
+    with tempfile.TemporaryDirectory() as folder:
+        if name == "plans":
+            pages, run = run_plans(args, folder)
+        elif name == "specs":
+            pages, run = run_specs(args, folder)
+        elif name == "image_page":
+            pages, run = run_image_page(args, folder, timer)
+        else:
+            pages, run = run_text_page(args, folder, timer)
+
+        best = None
+        for _ in range(args.repeat):
+            timer.reset()
+            start = time.perf_counter()
+            outcome = run()
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best["seconds"]:
+                stages = timer.stages
+                staged_seconds = sum(totals["seconds"] for totals in stages.values())
+                stages["other"] = {"calls": 0, "seconds": max(0.0, elapsed - staged_seconds)}
+                best = {"pages": pages, "seconds": elapsed, "pages_per_second": pages / elapsed, "stages": stages,
+                        **outcome}
+        return best
+
+
+def compare(results, baseline):
+    comparison = {}
+    for name, result in results["pipelines"].items():
+        previous = baseline.get("pipelines", {}).get(name)
+        if not previous or "seconds" not in result or "seconds" not in previous:
+            continue
+        comparison[name] = {
+            "speedup": previous["seconds"] / result["seconds"],
+            "stages": {stage: previous["stages"][stage]["seconds"] / totals["seconds"]
+                       for stage, totals in result["stages"].items()
+                       if stage in previous.get("stages", {}) and totals["seconds"] > 0},
+        }
+    return comparison
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pipelines", default=",".join(PIPELINES))
+    parser.add_argument("--plan-pages", type=int, default=60)
+    parser.add_argument("--spec-pages", type=int, default=200)
+    parser.add_argument("--schedule-pages", type=int, default=4)
+    parser.add_argument("--scanned-every", type=int, default=2, help="Every Nth drawing is scanned, 0 for none")
+    parser.add_argument("--spec-scanned-every", type=int, default=0, help="Every Nth spec page is scanned")
+    parser.add_argument("--ocr-mode", choices=list(ocr_backends.OCR_MODES), default=ocr_backends.DEFAULT_OCR_MODE)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for plans and image_page; stage timings only cover the main process")
+    parser.add_argument("--batch-size", type=int, default=pdf_processing.OCR_BATCH_SIZE)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per pipeline, the fastest one is reported")
+    parser.add_argument("--output", help="Also write the results to this file")
+    parser.add_argument("--compare", help="Results file of an earlier run to compute speedups against")
+    args = parser.parse_args()
+
+    pdf_processing.OCR_CACHE_ENABLED = False
+    pdf_processing.CHECKPOINTS_ENABLED = False
+    timer = StageTimer()
+    instrument(timer)
+
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "pymupdf": pymupdf.VersionBind,
+            "args": vars(args),
+        },
+        "pipelines": {},
+    }
+    for name in args.pipelines.split(","):
+        try:
+            results["pipelines"][name] = benchmark_pipeline(name, args, timer)
+        except ImportError as e:
+            results["pipelines"][name] = {"unavailable": str(e)}
+        except Exception as e:
+            results["pipelines"][name] = {"error": f"{type(e).__name__}: {e}"}
+
+    if args.compare:
+        with open(args.compare) as f:
+            results["comparison"] = compare(results, json.load(f))
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compares per-page latency and allocations of the title-block render + preprocessing pipeline.
+
+legacy:   RGB render -> Image.frombytes -> np.array -> cvtColor(RGB2BGR) -> preprocess_image
+          -> Image.fromarray -> np.array, i.e. the image handed to readtext before the rework
+current:  grayscale render -> pixmap_to_array (view) -> preprocess_image
+
+OCR itself is not included, both pipelines hand the same kind of array to the engine.
+
+Usage:
+    python benchmarks/preprocess_benchmark.py [--pages 200] [--page-size 2592x1728]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+
+import cv2
+import numpy as np
+import pymupdf
+from PIL import Image
+
+from pdf_processing import TITLE_BLOCK_ZOOM, pixmap_to_array, preprocess_image, render_title_block, title_block_box
+from synthetic_sets import make_plan_set
+
+
+def legacy_pipeline(page, box):
+    mat = pymupdf.Matrix(TITLE_BLOCK_ZOOM, TITLE_BLOCK_ZOOM)
+    pix = page.get_pixmap(matrix=mat, clip=box)
+    image = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    image_np = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+    preprocessed = preprocess_image(image_np)
+    return np.array(Image.fromarray(preprocessed))
+
+
+def current_pipeline(page, box):
+    pix = render_title_block(page, box)
+    return preprocess_image(pixmap_to_array(pix))
+
+
+def measure(pipeline, document):
+    pages = [document.load_page(page_num) for page_num in range(len(document))]
+    boxes = [title_block_box(page, "PLANS") for page in pages]
+
+    # tracemalloc only sees Python/NumPy allocations, MuPDF's and PIL's own buffers are not counted
+    tracemalloc.start()
+    start = time.perf_counter()
+    peak_per_page = 0
+    for page, box in zip(pages, boxes):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        pipeline(page, box)
+        peak_per_page = max(peak_per_page, tracemalloc.get_traced_memory()[1] - baseline)
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    return {
+        "ms_per_page": elapsed / len(pages) * 1000,
+        "peak_traced_bytes_per_page": peak_per_page,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-size", default="2592x1728", help="Page size in points, default ARCH D landscape")
+    args = parser.parse_args()
+
+    width, height = (float(v) for v in args.page_size.split("x"))
+    document = make_plan_set(args.pages, scanned_every=0, page_size=(width, height))
+
+    # Both pipelines must produce the same input for OCR
+    page = document.load_page(0)
+    box = title_block_box(page, "PLANS")
+    legacy, current = legacy_pipeline(page, box), current_pipeline(page, box)
+    differing = float(np.count_nonzero(legacy != current)) / legacy.size
+
+    results = {
+        "pages": args.pages,
+        "legacy": measure(legacy_pipeline, document),
+        "current": measure(current_pipeline, document),
+        "differing_pixel_ratio": differing,
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compares schedule table extraction from a text-based mechanical set, reported as tables per second.
+
+per_page  process_text_based_page on every page, one camelot.read_pdf call per page (the previous approach)
+batched   extract_schedule_tables: pages without 'schedule' in their text layer are skipped, the rest go
+          through Camelot in batches of --batch-pages
+pool      the same on --workers processes
+
+The set mixes vector schedule sheets with drawing sheets that have no schedule (--schedule-every).
+
+Usage:
+    python benchmarks/schedule_benchmark.py [--pages 120] [--schedule-every 4] [--workers 4] [--batch-pages 16]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+
+import pymupdf
+
+import pdf_processing_text
+from synthetic_sets import make_plan_set, make_schedule_pages
+
+
+def make_mechanical_set(pages, schedule_every):
+    document = pymupdf.open()
+    schedules = make_schedule_pages(1)
+    drawings = make_plan_set(1, scanned_every=0)
+    for page_num in range(pages):
+        document.insert_pdf(schedules if page_num % schedule_every == 0 else drawings)
+    return document
+
+
+def per_page(path, pages, args):
+    tables = 0
+    # process_text_based_page prints every table it extracts
+    with contextlib.redirect_stdout(io.StringIO()):
+        for page_num in range(pages):
+            tables += len(pdf_processing_text.process_text_based_page(path, page_num)[0])
+    return tables
+
+
+def batched(path, pages, args):
+    return sum(1 for _ in pdf_processing_text.extract_schedule_tables(path, batch_pages=args.batch_pages))
+
+
+def pool(path, pages, args):
+    return sum(1 for _ in pdf_processing_text.extract_schedule_tables(path, workers=args.workers,
+                                                                      batch_pages=args.batch_pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=120)
+    parser.add_argument("--schedule-every", type=int, default=4, help="Every Nth sheet is a schedule")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 1) // 2))
+    parser.add_argument("--batch-pages", type=int, default=pdf_processing_text.CAMELOT_BATCH_PAGES)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "mechanical_schedules.pdf")
+        make_mechanical_set(args.pages, args.schedule_every).save(path)
+        results["candidate_pages"] = len(pdf_processing_text.schedule_candidate_pages(path))
+        for name, method in (("per_page", per_page), ("batched", batched), ("pool", pool)):
+            start = time.perf_counter()
+            tables = method(path, args.pages, args)
+            elapsed = time.perf_counter() - start
+            results[name] = {"seconds": round(elapsed, 3), "tables": tables,
+                             "tables_per_second": round(tables / elapsed, 2)}
+    for name in ("batched", "pool"):
+        results[name]["speedup"] = round(results["per_page"]["seconds"] / results[name]["seconds"], 2)
+    print(json.dumps({"pages": args.pages, "workers": args.workers, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Measures import time and peak RSS of the processing modules in a fresh interpreter.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--module pdf_processor] [--load-ocr] [--runs 3]
+
+--load-ocr additionally constructs the EasyOCR reader, which is what every launch paid for
+before the reader was made lazy.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+if {load_ocr}:
+    from ocr_engine import get_easyocr_reader
+    get_easyocr_reader()
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    rss_mb = rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+except ImportError:
+    rss_mb = None
+print(json.dumps({{"seconds": elapsed, "peak_rss_mb": rss_mb}}))
+"""
+
+
+def measure(module, load_ocr):
+    script = CHILD_SCRIPT.format(module=module, load_ocr=load_ocr)
+    output = subprocess.check_output([sys.executable, "-c", script], cwd=REPO_ROOT)
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="pdf_processing")
+    parser.add_argument("--load-ocr", action="store_true")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    results = [measure(args.module, args.load_ocr) for _ in range(args.runs)]
+    summary = {
+        "module": args.module,
+        "load_ocr": args.load_ocr,
+        "runs": results,
+        "best_seconds": min(r["seconds"] for r in results),
+    }
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
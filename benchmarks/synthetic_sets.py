@@ -0,0 +1,161 @@
+"""Generators for synthetic drawing sets, spec books and schedule pages used by the benchmarks.
+
+Everything is drawn with PyMuPDF so no sample documents have to be shipped. "Scanned" pages are rendered
+from a vector page and inserted back as a raster only, so they have no text layer and need OCR.
+"""
+import numpy as np
+import pymupdf
+
+ARCH_D = (2592, 1728)
+LETTER = (612, 792)
+# Pages generated between saves when make_plan_set writes a set with large page rasters to disk
+PLAN_SET_FLUSH_PAGES = 50
+# Divisions of a spec book in order, with the share of pages each one gets; 23 is the one being extracted
+SPEC_DIVISIONS = [("00", 0.08), ("01", 0.12), ("03", 0.08), ("08", 0.1), ("09", 0.1), ("22", 0.12), ("23", 0.2),
+                  ("26", 0.15), ("31", 0.05)]
+
+
+def rasterize(page, dpi):
+    """Returns a page of a new single-page document that only holds page rendered at dpi."""
+    pix = page.get_pixmap(dpi=dpi, colorspace=pymupdf.csGRAY)
+    scanned = pymupdf.open()
+    scanned_page = scanned.new_page(width=page.rect.width, height=page.rect.height)
+    scanned_page.insert_image(scanned_page.rect, pixmap=pix)
+    return scanned
+
+
+def append_page(document, source, scanned, dpi):
+    if scanned:
+        source = rasterize(source[0], dpi)
+    document.insert_pdf(source)
+
+
+def plan_sheet_number(page_num, mechanical_every=3):
+    discipline = "M" if page_num % mechanical_every == 0 else "AESP"[page_num % 4]
+    return f"{discipline}-{100 + page_num:03d}"
+
+
+def make_logo():
+    """A noisy (incompressible) RGB raster; inserted on every page of a document it is stored once and shared."""
+    pixels = np.random.default_rng(0).integers(0, 255, 400 * 200 * 3, dtype=np.uint8).tobytes()
+    return pymupdf.Pixmap(pymupdf.csRGB, 400, 200, pixels, False)
+
+
+def draw_plan_sheet(page, sheet_number, lines=40, number_size=24, logo=None):
+    width, height = page.rect.width, page.rect.height
+    page.draw_rect(pymupdf.Rect(20, 20, width - 20, height - 20), width=2)
+    # Linework spread over 2000 points from the left, stopping short of the title block on smaller sheets
+    for x in (100 + i * 2000 / lines for i in range(lines)):
+        if x < width - 300:
+            page.draw_line((x, 100), (x, height - 200), width=0.5)
+    page.draw_rect(pymupdf.Rect(width - 290, height - 160, width - 20, height - 20), width=1.5)
+    if logo:
+        page.insert_image(pymupdf.Rect(width - 560, height - 160, width - 300, height - 30), pixmap=logo)
+    page.insert_text((width - 280, height - 130), "BRUCKER MECHANICAL", fontsize=10)
+    page.insert_text((width - 280, height - 115), "PROJECT NO. 2024-118", fontsize=8)
+    page.insert_text((width - 200, height - 60), sheet_number, fontsize=number_size)
+
+
+def make_plan_set(pages, scanned_every=2, mechanical_every=3, dpi=100, page_size=ARCH_D, small_number_every=0,
+                  lines=40, logo=False, page_image_kb=0, path=None):
+    """Drawing set with a title block and an M-xxx / A-xxx / E-xxx sheet number on every sheet.
+
+    Every scanned_every-th sheet is scanned (0 = all vector), every mechanical_every-th sheet is mechanical and
+    every small_number_every-th sheet number is printed at half size (0 = none). Vector sheets can carry a
+    shared raster logo and an incompressible raster of page_image_kb each, e.g. 1100 KB on 900 pages gives a
+    ~1 GB set like a scanned one. With path, the set is saved there every PLAN_SET_FLUSH_PAGES pages while it
+    is generated so large sets do not have to fit in memory, and the saved document is returned.
+    """
+    document = pymupdf.open()
+    width, height = page_size
+    logo = make_logo() if logo else None
+    rng = np.random.default_rng(1)
+    side = int((page_image_kb * 1024 / 3) ** 0.5)
+    for page_num in range(pages):
+        sheet_number = plan_sheet_number(page_num, mechanical_every)
+        number_size = 12 if small_number_every and page_num % small_number_every == 0 else 24
+        if scanned_every and page_num % scanned_every == scanned_every - 1:
+            source = pymupdf.open()
+            draw_plan_sheet(source.new_page(width=width, height=height), sheet_number, lines, number_size)
+            append_page(document, source, True, dpi)
+        else:
+            page = document.new_page(width=width, height=height)
+            draw_plan_sheet(page, sheet_number, lines, number_size, logo)
+            if side:
+                scan = pymupdf.Pixmap(pymupdf.csRGB, side, side,
+                                      rng.integers(0, 255, side * side * 3, dtype=np.uint8).tobytes(), False)
+                page.insert_image(pymupdf.Rect(100, 100, 1500, 1500), pixmap=scan)
+        if path and side and page_num % PLAN_SET_FLUSH_PAGES == PLAN_SET_FLUSH_PAGES - 1:
+            save_generated(document, path)
+            document.close()
+            document = pymupdf.open(path)
+    if path:
+        save_generated(document, path)
+    return document
+
+
+def save_generated(document, path):
+    # The first save writes the file, later ones append to it
+    if document.name:
+        document.save(path, incremental=True, encryption=pymupdf.PDF_ENCRYPT_KEEP)
+    else:
+        document.save(path, deflate=True)
+
+
+def spec_sections(pages):
+    """Returns the section number printed on each page of a spec book, divisions in SPEC_DIVISIONS order."""
+    sections = []
+    for division, share in SPEC_DIVISIONS:
+        division_pages = max(1, round(pages * share))
+        for index in range(division_pages):
+            # A new section every 4 pages within the division
+            sections.append(f"{division} {(index // 4) * 5 % 100:02d} 00 - {index % 4 + 1}")
+    return sections[:pages] + [sections[-1]] * (pages - len(sections))
+
+
+def make_spec_set(pages, scanned_every=0, dpi=150):
+    """Spec book on letter pages with a '23 05 00 - 3' style section footer in the bottom-right corner."""
+    document = pymupdf.open()
+    width, height = LETTER
+    for page_num, section in enumerate(spec_sections(pages)):
+        source = pymupdf.open()
+        page = source.new_page(width=width, height=height)
+        page.insert_text((72, 72), f"SECTION {section.split(' - ')[0]}", fontsize=12)
+        for line in range(30):
+            page.insert_text((72, 100 + line * 18), "The contractor shall provide all labor and materials.", fontsize=9)
+        page.insert_text((width - 200, height - 40), section, fontsize=10)
+        append_page(document, source, scanned_every and page_num % scanned_every == scanned_every - 1, dpi)
+    return document
+
+
+def section_page_range(pages, division="23"):
+    """Returns (first, last) page index of division in a book made by make_spec_set(pages)."""
+    indices = [index for index, section in enumerate(spec_sections(pages)) if section.startswith(division)]
+    return indices[0], indices[-1]
+
+
+def make_schedule_pages(pages, scanned=False, rows=12, dpi=150):
+    """Pages holding a titled equipment schedule table, vector or scanned."""
+    document = pymupdf.open()
+    width, height = ARCH_D
+    columns = ["TAG", "DESCRIPTION", "CFM", "ESP", "HP", "VOLTS"]
+    for page_num in range(pages):
+        source = pymupdf.open()
+        page = source.new_page(width=width, height=height)
+        left, top, cell_width, cell_height = 200, 200, 160, 28
+        page.insert_text((left, top - 20), "MECHANICAL EQUIPMENT SCHEDULE", fontsize=16)
+        for row in range(rows + 2):
+            y = top + row * cell_height
+            page.draw_line((left, y), (left + cell_width * len(columns), y))
+        for column in range(len(columns) + 1):
+            x = left + column * cell_width
+            page.draw_line((x, top), (x, top + (rows + 1) * cell_height))
+        for column, name in enumerate(columns):
+            page.insert_text((left + column * cell_width + 6, top + 19), name, fontsize=11)
+        for row in range(rows):
+            values = [f"AHU-{row + 1}", "AIR HANDLING UNIT", str(1000 + row * 250), "1.5", "5", "460"]
+            for column, value in enumerate(values):
+                page.insert_text((left + column * cell_width + 6, top + (row + 1) * cell_height + 19), value,
+                                 fontsize=10)
+        append_page(document, source, scanned, dpi)
+    return document
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import logging
+import os
+
+# Bump when the journal layout changes, journals written by another version are discarded
+JOURNAL_VERSION = 1
+# Input files are hashed in chunks of this size so a large drawing set is never read into memory at once
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_content_hash(path):
+    """sha256 of the file's bytes, so a renamed or copied input still finds its journal."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CheckpointJournal:
+    """Append-only journal of per-page classification results for one input file.
+
+    Each line holds the results of pages completed since the previous line and is flushed as soon as it
+    is written, so a cancelled or crashed extraction can resume from the pages already classified.
+    The first line records the parameters the results depend on; a journal written with different
+    parameters is discarded. A partially written last line (crash mid-write) is ignored.
+    """
+
+    def __init__(self, folder, content_hash, mode, params):
+        self.path = os.path.join(folder, f"{content_hash}_{mode}.jsonl")
+        self.header = {"version": JOURNAL_VERSION, "params": params}
+        self.results = {}
+        self._file = None
+        self._load()
+
+    @classmethod
+    def for_file(cls, folder, pdf_file, mode, params):
+        os.makedirs(folder, exist_ok=True)
+        return cls(folder, file_content_hash(pdf_file), mode, params)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                lines = f.read().splitlines()
+        except OSError as e:
+            logging.error("Error reading checkpoint journal %s: %s", self.path, e)
+            return
+
+        if not lines or self._parse(lines[0]) != self.header:
+            logging.info("Discarding checkpoint journal written with other parameters: %s", self.path)
+            self.discard()
+            return
+        for line in lines[1:]:
+            entry = self._parse(line)
+            if entry is None:
+                continue
+            for page_num, result in entry.items():
+                self.results[int(page_num)] = result
+        logging.info("Resuming from checkpoint journal %s: %d pages already classified", self.path,
+                     len(self.results))
+
+    @staticmethod
+    def _parse(line):
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    def record(self, results):
+        """Appends {page_num: result} to the journal and flushes it."""
+        if not results:
+            return
+        self.results.update(results)
+        try:
+            if self._file is None:
+                new_journal = not os.path.exists(self.path)
+                self._file = open(self.path, 'a')
+                if new_journal:
+                    self._file.write(json.dumps(self.header) + "\n")
+            self._file.write(json.dumps({str(page_num): result for page_num, result in results.items()}) + "\n")
+            self._file.flush()
+        except OSError as e:
+            # The journal is an optimization only, losing it must not fail the extraction
+            logging.error("Error writing checkpoint journal %s: %s", self.path, e)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """Closes and deletes the journal, called once the output PDF has been written."""
+        self.close()
+        self.results = {}
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error("Error removing checkpoint journal %s: %s", self.path, e)
@@ -0,0 +1,88 @@
+import logging
+import os
+import queue
+import threading
+from PIL import Image
+
+# Debug crops of the title block are opt-in. Modes:
+#   off      - never write crops (default)
+#   mismatch - only pages that did not match the filter, i.e. the ones worth looking at when a sheet is missed
+#   sample   - every Nth page (see DEBUG_CROPS_EVERY)
+#   all      - every page that was classified
+DEBUG_CROPS_MODES = ("off", "mismatch", "sample", "all")
+DEBUG_CROPS_MODE = os.getenv("PDF_ANALYSER_DEBUG_CROPS", "off").lower()
+DEBUG_CROPS_EVERY = int(os.getenv("PDF_ANALYSER_DEBUG_CROPS_EVERY", "50"))
+# Crops waiting for the writer thread; when full new crops are dropped instead of stalling classification
+DEBUG_CROPS_QUEUE_SIZE = 64
+
+if DEBUG_CROPS_MODE not in DEBUG_CROPS_MODES:
+    logging.error("Unknown debug crops mode '%s', expected one of %s", DEBUG_CROPS_MODE, DEBUG_CROPS_MODES)
+    DEBUG_CROPS_MODE = "off"
+
+
+def configure_debug_crops(mode, every=None):
+    global DEBUG_CROPS_MODE, DEBUG_CROPS_EVERY
+    if mode not in DEBUG_CROPS_MODES:
+        raise ValueError(f"Unknown debug crops mode '{mode}', expected one of {DEBUG_CROPS_MODES}")
+    DEBUG_CROPS_MODE = mode
+    if every:
+        DEBUG_CROPS_EVERY = every
+
+
+def should_capture_crop(page_num, match):
+    if DEBUG_CROPS_MODE == "all":
+        return True
+    if DEBUG_CROPS_MODE == "mismatch":
+        return not match
+    if DEBUG_CROPS_MODE == "sample":
+        return page_num % DEBUG_CROPS_EVERY == 0
+    return False
+
+
+class DebugCropWriter:
+    """Encodes and writes debug crops on a background thread so PNG encoding and disk I/O stay off the OCR path."""
+
+    def __init__(self, max_queue=DEBUG_CROPS_QUEUE_SIZE):
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_thread(self):
+        # Threads do not survive a fork, worker processes start their own
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                    self._queue = queue.Queue(maxsize=self._queue.maxsize)
+                    self._thread = threading.Thread(target=self._run, name="debug-crop-writer", daemon=True)
+                    self._pid = os.getpid()
+                    self._thread.start()
+
+    def submit(self, path, pix):
+        """Queues a copy of the pixmap's pixels to be written to path as PNG."""
+        self._ensure_thread()
+        mode = "L" if pix.n == 1 else "RGB"
+        try:
+            self._queue.put_nowait((path, mode, pix.width, pix.height, pix.samples))
+        except queue.Full:
+            logging.warning("Debug crop queue full, dropping crop: %s", path)
+
+    def flush(self):
+        """Blocks until every queued crop has been written."""
+        if self._thread is not None and self._pid == os.getpid():
+            self._queue.join()
+
+    def _run(self):
+        while True:
+            path, mode, width, height, samples = self._queue.get()
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                Image.frombytes(mode, (width, height), samples).save(path)
+                logging.debug("Cropped image saved for debugging: %s", path)
+            except Exception as e:
+                logging.error("Error saving debug crop %s: %s", path, e)
+            finally:
+                self._queue.task_done()
+
+
+debug_crop_writer = DebugCropWriter()
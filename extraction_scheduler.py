@@ -0,0 +1,112 @@
+import logging
+import multiprocessing
+import queue
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from logging_config import set_worker_log_level
+from ocr_engine import set_ocr_threads, wait_for_prewarm
+from pdf_processing import create_filtered_pdf, create_pdf_between_indices, DEFAULT_WORKERS, OCR_BATCH_SIZE
+
+# Upper bound on processes running OCR at the same time across all files, split between the files running at
+# once. Every one of them holds its own OCR models in memory, so this is what keeps a 20-file extraction from
+# exhausting RAM.
+MAX_CONCURRENT_OCR = DEFAULT_WORKERS
+# How often the scheduler wakes up to forward progress and check for cancellation, in seconds
+POLL_INTERVAL = 0.1
+
+
+class ExtractionCancelled(Exception):
+    pass
+
+
+# Per-process state of a file extraction worker, set up once by _init_file_worker
+_progress_queue = None
+_cancel_event = None
+
+
+def _init_file_worker(progress_queue, cancel_event, ocr_threads, log_level):
+    global _progress_queue, _cancel_event
+    _progress_queue = progress_queue
+    _cancel_event = cancel_event
+    set_worker_log_level(log_level)
+    set_ocr_threads(ocr_threads)
+
+
+def _extract_file(index, pdf_file, filter_type, batch_size, page_workers):
+    def progress_callback(progress):
+        if _cancel_event.is_set():
+            raise ExtractionCancelled("Extraction cancelled by user.")
+        _progress_queue.put((index, progress))
+
+    # Each file classifies its pages on its share of the worker processes
+    if filter_type == "PLANS":
+        return create_filtered_pdf(pdf_file, filter_type, progress_callback, workers=page_workers,
+                                   batch_size=batch_size)
+    return create_pdf_between_indices(pdf_file, progress_callback)
+
+
+def extract_files_concurrently(files, filter_type, on_progress, on_file_done, on_file_error, is_cancelled,
+                               max_concurrent=MAX_CONCURRENT_OCR, batch_size=OCR_BATCH_SIZE):
+    """Extracts several files at once on a bounded process pool, blocking the calling thread until all are done.
+
+    files maps the caller's file index to a PDF path. The callbacks are invoked on the calling thread:
+    on_progress(index, progress), on_file_done(index, filtered_pdf) and on_file_error(index, message).
+    is_cancelled() is polled; once it returns True running files stop at their next progress update and
+    queued files are never started. max_concurrent worker processes are split between the files running at
+    once: 2 files with 8 allowed classify their pages on 4 processes each, 20 files run 8 at a time on 1 each.
+    """
+    concurrent_files = max(1, min(max_concurrent, len(files)))
+    page_workers = max(1, max_concurrent // concurrent_files)
+    context = multiprocessing.get_context()
+    progress_queue = context.Queue()
+    cancel_event = context.Event()
+    ocr_threads = max(1, (multiprocessing.cpu_count() or 1) // concurrent_files)
+    logging.info("Extracting %d files, %d at a time on %d page workers each", len(files), concurrent_files,
+                 page_workers)
+    wait_for_prewarm(context.get_start_method())
+
+    executor = ProcessPoolExecutor(max_workers=concurrent_files, mp_context=context, initializer=_init_file_worker,
+                                   initargs=(progress_queue, cancel_event, ocr_threads, logging.getLogger().level))
+    pending = {executor.submit(_extract_file, index, pdf_file, filter_type, batch_size, page_workers): index
+               for index, pdf_file in files.items()}
+
+    def forward_progress():
+        while True:
+            try:
+                index, progress = progress_queue.get_nowait()
+            except queue.Empty:
+                return
+            if not cancel_event.is_set():
+                on_progress(index, progress)
+
+    try:
+        while pending:
+            if is_cancelled() and not cancel_event.is_set():
+                logging.info("Cancelling concurrent extraction")
+                cancel_event.set()
+                for future in pending:
+                    future.cancel()
+
+            done, _ = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            forward_progress()
+            for future in done:
+                index = pending.pop(future)
+                if future.cancelled():
+                    continue
+                try:
+                    filtered_pdf = future.result()
+                except ExtractionCancelled:
+                    logging.info("Extraction canceled for file: %s", files[index])
+                    continue
+                except Exception as e:
+                    logging.error("Error during extraction of %s: %s", files[index], e)
+                    on_file_error(index, str(e))
+                    continue
+
+                if filtered_pdf:
+                    on_file_done(index, filtered_pdf)
+                else:
+                    on_file_error(index, "No matching pages found")
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    # Updates still in flight when the last file finished
+    forward_progress()
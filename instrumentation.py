@@ -0,0 +1,132 @@
+import cProfile
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Pipeline stages timed by timed_stage, in the order they run for a page
+STAGES = ("layout_probe", "fingerprint", "text_layer", "render", "preprocess", "ocr_cache", "ocr", "write")
+
+# Optional profile of a whole extraction, for digging below the stage breakdown. Modes:
+#   off          - no profiling (default)
+#   cprofile     - <name>.prof, open with pstats or snakeviz
+#   pyinstrument - <name>.html, needs pyinstrument installed
+# Only the process running the extraction is profiled, not its page classification workers.
+PROFILE_MODES = ("off", "cprofile", "pyinstrument")
+PROFILE_MODE = os.getenv("PDF_ANALYSER_PROFILE", "off").lower()
+
+if PROFILE_MODE not in PROFILE_MODES:
+    logging.error("Unknown profile mode '%s', expected one of %s", PROFILE_MODE, PROFILE_MODES)
+    PROFILE_MODE = "off"
+
+# Stack of time spent in nested stages, one per thread
+_nested_seconds = threading.local()
+
+
+@contextmanager
+def timed_stage(stats, stage):
+    """Adds the wall time spent in the block to stats[f"{stage}_seconds"].
+
+    Time spent in a stage nested inside the block (e.g. rendering during the layout probe) is only counted for
+    the nested stage, so the stage totals add up to the time actually spent.
+    """
+    stack = _nested_seconds.__dict__.setdefault("stack", [])
+    stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        stats[f"{stage}_seconds"] += elapsed - nested
+
+
+def file_summary(pdf_file, output_path, stats, total_pages, seconds, workers=1):
+    """Returns the JSON-friendly summary of one extraction from its share of the processing stats."""
+    stages = {stage: round(float(stats[f"{stage}_seconds"]), 3) for stage in STAGES}
+    return {
+        "file": pdf_file,
+        "output": output_path,
+        "pages": total_pages,
+        "seconds": round(seconds, 3),
+        "pages_per_second": round(total_pages / seconds, 2) if seconds else None,
+        # With several workers the stages run in parallel and add up to more than the wall time
+        "workers": workers,
+        "stages": stages,
+        "other_seconds": round(max(0.0, seconds - sum(stages.values())), 3) if workers == 1 else None,
+        "counts": {key: value for key, value in sorted(stats.items()) if not key.endswith("_seconds")},
+    }
+
+
+def summary_path(output_path):
+    return f"{os.path.splitext(output_path)[0]}.metrics.json"
+
+
+def write_summary(summary, output_path):
+    path = summary_path(output_path)
+    try:
+        with open(path, "w") as f:
+            json.dump(summary, f, indent=2)
+    except OSError as e:
+        logging.error("Error writing metrics summary %s: %s", path, e)
+        return None
+    return path
+
+
+def load_summary(output_path):
+    """Returns the summary written next to output_path, or None when there is none."""
+    try:
+        with open(summary_path(output_path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def format_stage_breakdown(summary, limit=3):
+    """Short text of the limit slowest stages (all when None), e.g. 'ocr 41.2s · render 3.1s · write 0.4s'."""
+    stages = sorted(((seconds, stage) for stage, seconds in summary["stages"].items() if seconds >= 0.05),
+                    reverse=True)
+    return " · ".join(f"{stage} {seconds:.1f}s" for seconds, stage in stages[:limit])
+
+
+def profiled(folder):
+    """Decorates an extraction function taking the PDF path first; profiles each call when PROFILE_MODE is set."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(pdf_file, *args, **kwargs):
+            if PROFILE_MODE == "off":
+                return func(pdf_file, *args, **kwargs)
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, os.path.splitext(os.path.basename(pdf_file))[0])
+            if PROFILE_MODE == "cprofile":
+                profiler = cProfile.Profile()
+                try:
+                    return profiler.runcall(func, pdf_file, *args, **kwargs)
+                finally:
+                    profiler.dump_stats(f"{path}.prof")
+                    logging.info("Profile written to: %s.prof", path)
+
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                logging.error("pyinstrument is not installed, running without profiling")
+                return func(pdf_file, *args, **kwargs)
+            profiler = Profiler()
+            profiler.start()
+            try:
+                return func(pdf_file, *args, **kwargs)
+            finally:
+                profiler.stop()
+                with open(f"{path}.html", "w") as f:
+                    f.write(profiler.output_html())
+                logging.info("Profile written to: %s.html", path)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,60 @@
+import logging
+
+# Pages whose sheet/section number location has to agree before the layout is trusted
+LAYOUT_PROBE_PAGES = 3
+# Pages tried from the start of the document before giving up, covers a cover sheet or a few unreadable pages
+LAYOUT_PROBE_MAX_PAGES = 8
+# Points added around the union of the probed token boxes, absorbs small shifts between sheets
+LAYOUT_PADDING = 12
+# Token boxes further apart than this (in points, on any edge) mean the document has no single layout
+LAYOUT_TOLERANCE = 36
+
+
+def pick_number_token(lines, pattern):
+    """Returns the box of the tallest line matching pattern, or None.
+
+    lines is a list of (x0, y0, x1, y1, text) in page coordinates. Sheet numbers are the largest text in a
+    title block, so the tallest match wins over grid labels or detail references of the same shape.
+    """
+    best = None
+    for x0, y0, x1, y1, text in lines:
+        if pattern.match(text) and (best is None or y1 - y0 > best[3] - best[1]):
+            best = (x0, y0, x1, y1)
+    return best
+
+
+def corner_offsets(page_width, page_height, token_box):
+    # Distances from the page's bottom-right corner, so the layout carries over to sheets of another size
+    x0, y0, x1, y1 = token_box
+    return page_width - x0, page_height - y0, page_width - x1, page_height - y1
+
+
+def probe_layout(total_pages, find_token, probe_pages=LAYOUT_PROBE_PAGES, max_pages=LAYOUT_PROBE_MAX_PAGES):
+    """Locates the sheet/section number on the first pages of a document and returns a padded box for it.
+
+    find_token(page_num) returns (page_width, page_height, token box) or None when the page has no readable
+    number. The result is (left, top, right, bottom) as distances from the bottom-right corner of the page,
+    or None when too few pages had a number or the pages disagree on where it is.
+    """
+    offsets = []
+    for page_num in range(min(total_pages, max_pages)):
+        found = find_token(page_num)
+        if found:
+            offsets.append(corner_offsets(*found))
+            if len(offsets) >= probe_pages:
+                break
+
+    if not offsets or len(offsets) < min(probe_pages, total_pages):
+        logging.info("Layout probe: number found on %d pages, keeping the default title block box", len(offsets))
+        return None
+
+    edges = list(zip(*offsets))
+    if any(max(edge) - min(edge) > LAYOUT_TOLERANCE for edge in edges):
+        logging.info("Layout probe: number position varies between pages %s, keeping the default box", offsets)
+        return None
+
+    left, top, right, bottom = edges
+    layout = (max(left) + LAYOUT_PADDING, max(top) + LAYOUT_PADDING,
+              max(0.0, min(right) - LAYOUT_PADDING), max(0.0, min(bottom) - LAYOUT_PADDING))
+    logging.info("Layout probe: number located at corner offsets %s on %d pages", layout, len(offsets))
+    return layout
@@ -0,0 +1,87 @@
+import atexit
+import logging
+import multiprocessing.util
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+# Verbosity of the GUI and of anything else that does not pass its own level: DEBUG adds the per-token and
+# per-attempt OCR lines, INFO logs one summary line per page, WARNING only problems
+LOG_LEVEL = os.getenv("PDF_ANALYSER_LOG_LEVEL", "INFO").upper()
+
+# Records are put on a queue by the logging thread and formatted/written by the listener's thread, so console
+# or file I/O never stalls rendering and OCR
+_listener = None
+_handler = None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler for an in-process queue that leaves the %-interpolation of the message to the listener.
+
+    The stock handler formats every record before queueing it (so it can be pickled); records here never leave
+    the process, so the logging thread only pays for creating the record. Arguments are formatted later and
+    must not be mutated after the logging call.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def configure_logging(level=None, stream=None):
+    """Sends the root logger's records through a queue to a background thread writing them to stream (stderr).
+
+    Like logging.basicConfig this does nothing when the root logger already has handlers, so the first caller
+    (the CLI, the GUI or the import of pdf_processing) decides the level and destination.
+    """
+    global _listener, _handler
+    root = logging.getLogger()
+    if root.handlers:
+        return
+
+    level = (level or LOG_LEVEL).upper()
+    unknown_level = None
+    if not isinstance(logging.getLevelName(level), int):
+        unknown_level, level = level, "INFO"
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+    _handler = DeferredQueueHandler(queue.SimpleQueue())
+    _listener = QueueListener(_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    root.addHandler(_handler)
+    root.setLevel(level)
+    # Records still queued at exit are written before the interpreter goes away
+    atexit.register(stop_logging)
+    multiprocessing.util.register_after_fork(_handler, _restart_listener)
+    if unknown_level:
+        logging.error("Unknown log level '%s', using INFO", unknown_level)
+
+
+def set_worker_log_level(level):
+    """Applies the parent's root level in a worker process.
+
+    Spawned workers (Windows) re-import the modules, whose configure_logging() call falls back to LOG_LEVEL;
+    the level the entry point chose (e.g. the CLI's --log-level) is passed to the worker initializer instead.
+    """
+    logging.getLogger().setLevel(level)
+
+
+def stop_logging():
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_listener(handler):
+    # The listener thread does not survive a fork (worker processes on Linux), the child gets its own queue and
+    # thread. Forked workers leave through os._exit, which skips atexit, so the queue is drained by a finalizer.
+    global _listener
+    if _listener is None:
+        return
+    handler.queue = queue.SimpleQueue()
+    _listener = QueueListener(handler.queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+    multiprocessing.util.Finalize(None, stop_logging, exitpriority=-1)
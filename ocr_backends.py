@@ -0,0 +1,127 @@
+import logging
+from ocr_engine import get_easyocr_reader
+
+# Characters that can appear in a sheet number (M-101, ME1.1) or a spec section number (23 05 00); restricting
+# Tesseract to them avoids O/0 and I/1 confusions and speeds up its recognizer
+TESSERACT_WHITELIST = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-."
+# PSM 7: treat the image as a single text line, which is what the probed (tight) title block box contains
+TESSERACT_CONFIG = f"--psm 7 -c tessedit_char_whitelist={TESSERACT_WHITELIST}"
+# PSM 11: sparse text, for the default box, which also holds the project name, dates and revisions
+TESSERACT_SPARSE_CONFIG = f"--psm 11 -c tessedit_char_whitelist={TESSERACT_WHITELIST}"
+
+# Image backends tried per OCR mode, in order. In "cascade" a title block only goes to the next backend when the
+# previous one did not read a sheet/section number confidently.
+OCR_MODES = {
+    "text_layer": (),
+    "tesseract": ("tesseract",),
+    "easyocr": ("easyocr",),
+    "cascade": ("tesseract", "easyocr"),
+}
+DEFAULT_OCR_MODE = "easyocr"
+
+
+class OcrBackend:
+    """Recognizes text in preprocessed title block images.
+
+    Images are preprocess_image output: 2-D uint8 with white text on black. Results are one
+    [(text, confidence)] list per image, confidence in 0..1.
+    """
+
+    name = None
+
+    def recognize(self, image):
+        raise NotImplementedError
+
+    def recognize_batch(self, images):
+        return [self.recognize(image) for image in images]
+
+    def is_available(self):
+        return True
+
+    def for_box(self, tight):
+        """Returns the backend to read a box with, tight when the box holds only the number (probed layout)."""
+        return self
+
+
+class EasyOcrBackend(OcrBackend):
+    name = "easyocr"
+
+    def recognize(self, image):
+        return easyocr_results(get_easyocr_reader().readtext(image, detail=1))
+
+    def recognize_batch(self, images):
+        # readtext_batched needs equally sized images, so images are grouped by shape and each group goes
+        # through detection as a single batch
+        results = [None] * len(images)
+        groups = {}
+        for index, image in enumerate(images):
+            groups.setdefault(image.shape, []).append(index)
+
+        reader = get_easyocr_reader()
+        for indices in groups.values():
+            group_results = reader.readtext_batched([images[index] for index in indices], detail=1)
+            for index, detail_results in zip(indices, group_results):
+                results[index] = easyocr_results(detail_results)
+        return results
+
+
+class TesseractBackend(OcrBackend):
+    def __init__(self, name="tesseract", config=TESSERACT_CONFIG):
+        # The name also keys the OCR cache, so results of different page segmentation modes are kept apart
+        self.name = name
+        self.config = config
+        self._available = None
+
+    def recognize(self, image):
+        import pytesseract
+        # Tesseract expects dark text on a light background
+        data = pytesseract.image_to_data(255 - image, config=self.config, output_type=pytesseract.Output.DICT)
+        lines = {}
+        for text, confidence, block, paragraph, line in zip(data["text"], data["conf"], data["block_num"],
+                                                           data["par_num"], data["line_num"]):
+            if text.strip() and float(confidence) >= 0:
+                lines.setdefault((block, paragraph, line), []).append((text.strip(), float(confidence)))
+        # One result per text line, as confident as its least confident word
+        return [(' '.join(text for text, _ in words), min(confidence for _, confidence in words) / 100)
+                for words in lines.values()]
+
+    def for_box(self, tight):
+        # A single text line only holds for the tight box, the default box is read as sparse text
+        return _backends["tesseract"] if tight else _tesseract_sparse
+
+    def is_available(self):
+        if self._available is None:
+            try:
+                import pytesseract
+                pytesseract.get_tesseract_version()
+                self._available = True
+            except Exception as e:
+                logging.error("Tesseract is not available: %s", e)
+                self._available = False
+        return self._available
+
+
+def easyocr_results(detail_results):
+    # EasyOCR's detail=1 entries are (bbox, text, confidence), only text and a JSON-friendly confidence are kept
+    return [(text, float(confidence)) for _, text, confidence in detail_results]
+
+
+_backends = {backend.name: backend for backend in (EasyOcrBackend(), TesseractBackend())}
+_tesseract_sparse = TesseractBackend("tesseract_sparse", TESSERACT_SPARSE_CONFIG)
+
+
+def get_ocr_backend(name):
+    return _backends[name]
+
+
+def ocr_mode_backends(mode):
+    """Returns the image backends of an OCR mode, in the order they are tried.
+
+    Unavailable backends are dropped from a cascade; a mode left without any of its backends raises ValueError.
+    """
+    if mode not in OCR_MODES:
+        raise ValueError(f"Unknown OCR mode '{mode}', expected one of {tuple(OCR_MODES)}")
+    backends = [_backends[name] for name in OCR_MODES[mode] if _backends[name].is_available()]
+    if OCR_MODES[mode] and not backends:
+        raise ValueError(f"OCR mode '{mode}' has no available backend")
+    return backends
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# Upper bound on the stored OCR results (keys + recognized strings) before least recently used rows are evicted
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# The total size is only re-checked every this many inserts, SUM() over the table is not free
+EVICTION_CHECK_INTERVAL = 64
+# Evict down to this fraction of max_bytes so the next few inserts do not immediately evict again
+EVICTION_TARGET_RATIO = 0.9
+
+
+def make_cache_key(image_bytes, params):
+    """Hashes the rendered clip together with everything that affects what OCR returns for it."""
+    digest = hashlib.sha256(image_bytes)
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class OcrResultCache:
+    """SQLite-backed cache of OCR results keyed by make_cache_key, with LRU size-bounded eviction.
+
+    The connection is opened lazily and re-opened after a fork, so one instance can be shared by the
+    page classification worker processes; concurrent writers are serialized by SQLite's WAL journal.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._connection = None
+        self._pid = None
+        self._inserts_since_check = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS ocr_results ("
+                "key TEXT PRIMARY KEY, texts TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ocr_results_last_used ON ocr_results (last_used)")
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, key):
+        with self._lock:
+            try:
+                connection = self._connect()
+                row = connection.execute("SELECT texts FROM ocr_results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                connection.execute("UPDATE ocr_results SET last_used = ? WHERE key = ?", (time.time(), key))
+                connection.commit()
+            except sqlite3.Error as e:
+                # The cache is an optimization only, a broken or locked database must not fail the extraction
+                logging.error("Error reading OCR cache %s: %s", self.path, e)
+                return None
+        return json.loads(row[0])
+
+    def put(self, key, texts):
+        payload = json.dumps(texts)
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO ocr_results (key, texts, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, payload, len(key) + len(payload), time.time())
+                )
+                connection.commit()
+                self._inserts_since_check += 1
+                if self._inserts_since_check >= EVICTION_CHECK_INTERVAL:
+                    self._inserts_since_check = 0
+                    self._evict(connection)
+            except sqlite3.Error as e:
+                logging.error("Error writing OCR cache %s: %s", self.path, e)
+
+    def _evict(self, connection):
+        total_size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_results").fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * EVICTION_TARGET_RATIO)
+        freed = 0
+        evicted_keys = []
+        for key, size in connection.execute("SELECT key, size FROM ocr_results ORDER BY last_used"):
+            if total_size - freed <= target:
+                break
+            evicted_keys.append((key,))
+            freed += size
+        connection.executemany("DELETE FROM ocr_results WHERE key = ?", evicted_keys)
+        connection.commit()
+        logging.info("OCR cache evicted %d entries (%d bytes)", len(evicted_keys), freed)
+
+    def clear(self):
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM ocr_results")
+            connection.commit()
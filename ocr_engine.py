@@ -0,0 +1,86 @@
+import logging
+import os
+import sys
+import threading
+
+# EasyOCR pulls in torch and loads its detection/recognition models on construction, which takes
+# seconds and hundreds of MB. The reader is therefore built on first use instead of at import time.
+EASYOCR_LANGUAGES = ['en']
+EASYOCR_GPU = False
+
+_easyocr_reader = None
+_ocr_threads = None
+_easyocr_lock = threading.Lock()
+_prewarm_thread = None
+
+
+def get_easyocr_reader():
+    """Returns the shared EasyOCR reader, constructing it on first call (thread-safe)."""
+    global _easyocr_reader
+    if _easyocr_reader is None:
+        with _easyocr_lock:
+            # Re-check under the lock so concurrent callers build the reader only once
+            if _easyocr_reader is None:
+                logging.info("Loading EasyOCR reader...")
+                import easyocr
+                if _ocr_threads:
+                    import torch
+                    torch.set_num_threads(_ocr_threads)
+                _easyocr_reader = easyocr.Reader(EASYOCR_LANGUAGES, gpu=EASYOCR_GPU)
+                logging.info("EasyOCR reader loaded.")
+    return _easyocr_reader
+
+
+def set_ocr_threads(threads):
+    """Limits the intra-op threads the OCR engine may use.
+
+    Applied when the reader is constructed, and right away when torch is already loaded: a forked worker
+    inherits the parent's reader (pre-warmed by the GUI or loaded by the layout probe) and never builds one.
+    """
+    global _ocr_threads
+    _ocr_threads = threads
+    if threads and "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(threads)
+
+
+def get_ocr_threads():
+    """Returns the limit set by set_ocr_threads, None when the engine may use every core."""
+    return _ocr_threads
+
+
+def prewarm_ocr_engine():
+    """Starts loading the EasyOCR reader on a daemon thread so the first extraction does not pay for it."""
+    global _prewarm_thread
+    if _easyocr_reader is not None or (_prewarm_thread is not None and _prewarm_thread.is_alive()):
+        return _prewarm_thread
+
+    def _load():
+        try:
+            get_easyocr_reader()
+        except Exception as e:
+            # A failed pre-warm is not fatal, the next real OCR call will retry and surface the error
+            logging.error("Error pre-warming EasyOCR reader: %s", e)
+
+    _prewarm_thread = threading.Thread(target=_load, name="ocr-prewarm", daemon=True)
+    _prewarm_thread.start()
+    return _prewarm_thread
+
+
+def wait_for_prewarm(start_method):
+    """Blocks until a running pre-warm has finished when worker processes are about to be forked.
+
+    A child forked in the middle of the pre-warm would inherit a half-built reader and a held _easyocr_lock
+    that no thread in the child can release. Once the pre-warm is done the children share the loaded reader.
+    """
+    if start_method == "fork" and _prewarm_thread is not None:
+        _prewarm_thread.join()
+
+
+def _reset_lock_in_child():
+    # Only the forking thread survives in the child, a lock held by any other thread would never be released
+    global _easyocr_lock
+    _easyocr_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_lock_in_child)
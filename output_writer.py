@@ -0,0 +1,98 @@
+import logging
+import os
+import pymupdf
+
+# Matched pages collected before they are appended to the partial output, bounds both memory and write count
+OUTPUT_CHUNK_PAGES = 32
+
+
+def partial_output_path(output_path):
+    root, ext = os.path.splitext(output_path)
+    return f"{root}.partial{ext}"
+
+
+class PartialPdfWriter:
+    """Appends matched pages to a partial output PDF while classification is still running.
+
+    Results may arrive out of order (parallel classification); pages are appended in page order as soon as
+    every page before them has been classified. Each chunk is added with an incremental save and the output
+    is closed again afterwards, so memory does not grow with the output and the file on disk is a valid PDF
+    between chunks. If the extraction is cancelled or fails, finish_partial() writes the remaining matched
+    pages and leaves the file in place; on success the caller writes the compact final output and discards
+    the partial file.
+    """
+
+    def __init__(self, source_document, output_path, chunk_pages=OUTPUT_CHUNK_PAGES):
+        self.source_document = source_document
+        self.path = partial_output_path(output_path)
+        self.chunk_pages = chunk_pages
+        self.written_pages = 0
+        # Size of the partial output on disk; chunks after the first are appended, so this is what was written
+        self.written_bytes = 0
+        self._results = {}
+        self._next_page = 0
+        self._pending_pages = []
+        self._started = False
+
+    def add(self, results):
+        """Takes {page_num: match} for newly classified pages."""
+        self._results.update(results)
+        while self._next_page in self._results:
+            if self._results.pop(self._next_page):
+                self._pending_pages.append(self._next_page)
+            self._next_page += 1
+        if len(self._pending_pages) >= self.chunk_pages:
+            self.flush()
+
+    def flush(self):
+        if not self._pending_pages:
+            return
+        try:
+            if self._started:
+                output = pymupdf.open(self.path)
+            else:
+                # A partial file from an earlier, interrupted run is replaced, not appended to
+                output = pymupdf.open()
+            try:
+                for first, last in page_runs(self._pending_pages):
+                    output.insert_pdf(self.source_document, from_page=first, to_page=last)
+                if self._started:
+                    output.save(self.path, incremental=True, encryption=pymupdf.PDF_ENCRYPT_KEEP)
+                else:
+                    output.save(self.path, garbage=1, deflate=True)
+            finally:
+                output.close()
+        except Exception as e:
+            # The partial output is a safety net only, failing to write it must not fail the extraction
+            logging.error("Error writing partial output %s: %s", self.path, e)
+            return
+        self._started = True
+        self.written_pages += len(self._pending_pages)
+        self.written_bytes = os.path.getsize(self.path)
+        self._pending_pages = []
+
+    def finish_partial(self):
+        """Writes the pages matched so far, called when the extraction stops before the final output is written."""
+        self.flush()
+        if self._started:
+            logging.info("Partial output with %d pages kept at: %s", self.written_pages, self.path)
+
+    def discard(self):
+        """Deletes the partial output, including one left by an earlier interrupted run."""
+        self._pending_pages = []
+        if os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                logging.error("Error removing partial output %s: %s", self.path, e)
+
+
+def page_runs(page_numbers):
+    """Groups sorted page numbers into (first, last) runs of consecutive pages."""
+    runs = []
+    for page_num in page_numbers:
+        if runs and runs[-1][1] == page_num - 1:
+            runs[-1][1] = page_num
+        else:
+            runs.append([page_num, page_num])
+    return [tuple(run) for run in runs]
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+# Bump when page_fingerprint changes, fingerprints of another version never match
+FINGERPRINT_VERSION = 1
+
+
+def page_fingerprint(document, page_num, stream_digests=None):
+    """sha256 over everything the page is drawn from, or None when that cannot be covered cheaply.
+
+    The page's content stream, its geometry and the streams of the images, form XObjects and fonts it uses
+    (by resource name) are hashed, without rendering or decoding anything. Byte-identical sheets re-issued in
+    a revision set get the same fingerprint even though they sit in another file. Pages with annotations
+    (stamps, markups) or Type3 fonts get None, their appearance streams and glyph procedures are not covered.
+    stream_digests memoizes the digest per xref, resources are shared by many pages of a document.
+    """
+    if stream_digests is None:
+        stream_digests = {}
+    fitz_page = document.load_page(page_num)
+    fonts = fitz_page.get_fonts(full=True)
+    # Type3 glyphs are drawn by content streams of their own that are not hashed here
+    if fitz_page.first_annot is not None or any(font[2] == "Type3" for font in fonts):
+        return None
+
+    def stream_digest(xref, font=False):
+        if xref not in stream_digests:
+            if font:
+                basefont, _, _, buffer = document.extract_font(xref)
+                data = basefont.encode() + (buffer or b"")
+            else:
+                data = document.xref_stream_raw(xref) or b""
+            stream_digests[xref] = hashlib.sha256(data).hexdigest()
+        return stream_digests[xref]
+
+    digest = hashlib.sha256(f"v{FINGERPRINT_VERSION} {tuple(fitz_page.rect)} {fitz_page.rotation}".encode())
+    digest.update(fitz_page.read_contents())
+    resources = sorted(
+        [("image", image[7], stream_digest(image[0])) for image in fitz_page.get_images(full=True)]
+        + [("form", xobject[1], stream_digest(xobject[0])) for xobject in fitz_page.get_xobjects()]
+        + [("font", font[4], stream_digest(font[0], font=True)) for font in fonts]
+    )
+    digest.update(json.dumps(resources).encode())
+    return digest.hexdigest()
+
+
+def project_index_path(folder, pdf_file):
+    # A project is the folder the input is in, issues and revisions of a job are usually kept together
+    project_folder = os.path.dirname(os.path.abspath(pdf_file))
+    project_key = hashlib.sha256(project_folder.encode()).hexdigest()[:16]
+    return os.path.join(folder, f"{os.path.basename(project_folder) or 'root'}_{project_key}.sqlite")
+
+
+class PageFingerprintIndex:
+    """SQLite-backed map of page fingerprint -> classification result for one project.
+
+    Results are stored per set of parameters (filter type, OCR mode, preprocessing version, layout, ...), a
+    page classified with other parameters is classified again. Lookups and writes happen in the process that
+    runs the extraction, page classification workers never touch the index.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_file(cls, folder, pdf_file):
+        os.makedirs(folder, exist_ok=True)
+        return cls(project_index_path(folder, pdf_file))
+
+    def _connect(self):
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS page_results ("
+                "fingerprint TEXT NOT NULL, params TEXT NOT NULL, result TEXT NOT NULL, "
+                "PRIMARY KEY (fingerprint, params))"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def lookup(self, fingerprints, params):
+        """Returns {fingerprint: result} for the given fingerprints that were classified with params."""
+        params_key = json.dumps(params, sort_keys=True)
+        fingerprints = list(set(fingerprints))
+        found = {}
+        with self._lock:
+            try:
+                connection = self._connect()
+                # SQLite limits the number of bound variables per statement
+                for start in range(0, len(fingerprints), 500):
+                    batch = fingerprints[start:start + 500]
+                    rows = connection.execute(
+                        f"SELECT fingerprint, result FROM page_results WHERE params = ? "
+                        f"AND fingerprint IN ({', '.join('?' * len(batch))})", [params_key] + batch
+                    )
+                    found.update((fingerprint, json.loads(result)) for fingerprint, result in rows)
+            except sqlite3.Error as e:
+                # The index is an optimization only, a broken or locked database must not fail the extraction
+                logging.error("Error reading page fingerprint index %s: %s", self.path, e)
+                return {}
+        return found
+
+    def store(self, results, params):
+        """Takes {fingerprint: result} for pages classified with params."""
+        if not results:
+            return
+        params_key = json.dumps(params, sort_keys=True)
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.executemany(
+                    "INSERT OR REPLACE INTO page_results (fingerprint, params, result) VALUES (?, ?, ?)",
+                    [(fingerprint, params_key, json.dumps(result)) for fingerprint, result in results.items()]
+                )
+                connection.commit()
+            except sqlite3.Error as e:
+                logging.error("Error writing page fingerprint index %s: %s", self.path, e)
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
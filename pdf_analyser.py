@@ -0,0 +1,172 @@
+"""Headless batch entry point for unattended PLANS / SPECIFICATIONS filtering.
+
+    python -m pdf_analyser plans "D:/jobs/**/*.pdf" --out D:/filtered --workers 4
+    python -m pdf_analyser specs D:/jobs/specbooks --out D:/filtered
+
+Inputs may be files, glob patterns or directories (searched recursively for PDFs). Progress is written
+to stdout as one JSON object per line, logs go to stderr. The GUI stack (PyQt5) is never imported.
+
+Exit codes:
+    0  every file was processed
+    1  at least one file failed or had no matching pages (SPECIFICATIONS)
+    2  bad arguments or no input PDFs found
+    130  interrupted
+"""
+import argparse
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from instrumentation import load_summary
+from logging_config import configure_logging
+from ocr_backends import DEFAULT_OCR_MODE, OCR_MODES
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+def emit(event, **fields):
+    print(json.dumps({"event": event, **fields}), flush=True)
+
+
+def is_within(path, directory):
+    path, directory = (os.path.normcase(os.path.abspath(p)) for p in (path, directory))
+    return path == directory or path.startswith(directory.rstrip(os.sep) + os.sep)
+
+
+def pattern_root(pattern):
+    # The directory a glob pattern searches from, i.e. its leading components without wildcards
+    while glob.has_magic(pattern):
+        pattern = os.path.dirname(pattern)
+    return pattern or os.curdir
+
+
+def expand_inputs(inputs, output_folder=None):
+    """Returns [(pdf_file, output sub-directory)] for files, glob patterns and directories, without duplicates.
+
+    PDFs under output_folder are skipped when it lies inside a searched directory, so the filtered PDFs of an
+    earlier run are not picked up as inputs again.
+    """
+    found = []
+    seen = set()
+
+    def add(path, sub_directory):
+        key = os.path.normcase(os.path.abspath(path))
+        if key not in seen:
+            seen.add(key)
+            found.append((path, sub_directory))
+
+    for pattern in inputs:
+        paths = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        # Only an output folder below the searched one is skipped, not one the inputs themselves live in
+        skip_output = output_folder and not is_within(pattern_root(pattern), output_folder)
+        for path in sorted(paths):
+            if skip_output and is_within(path, output_folder):
+                continue
+            if os.path.isdir(path):
+                # Keep the directory layout under --out so same-named PDFs from different folders do not collide
+                for root, directories, files in os.walk(path):
+                    if skip_output:
+                        directories[:] = [name for name in directories
+                                          if not is_within(os.path.join(root, name), output_folder)]
+                    for name in sorted(files):
+                        if name.lower().endswith(".pdf"):
+                            add(os.path.join(root, name), os.path.relpath(root, path))
+            elif os.path.isfile(path) and path.lower().endswith(".pdf"):
+                add(path, "")
+    return found
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="pdf_analyser", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["plans", "specs"], help="PLANS filter or SPECIFICATIONS section extraction")
+    parser.add_argument("inputs", nargs="+", help="PDF files, glob patterns or directories")
+    parser.add_argument("--out", required=True, help="Directory for the filtered PDFs")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for page classification (PLANS), default: half the cores")
+    parser.add_argument("--batch-size", type=int, default=None, help="Title blocks per OCR batch (PLANS)")
+    parser.add_argument("--ocr-mode", choices=list(OCR_MODES), default=DEFAULT_OCR_MODE,
+                        help="OCR engine for title blocks without a usable text layer; cascade tries Tesseract "
+                             "first and EasyOCR only when Tesseract is inconclusive")
+    parser.add_argument("--log-level", default="WARNING", help="Log level for stderr, e.g. INFO or DEBUG")
+    return parser.parse_args(argv)
+
+
+def process_file(pdf_file, output_folder, args):
+    # Imported here so --help and argument errors do not pay for loading the processing stack
+    from pdf_processing import create_filtered_pdf, create_pdf_between_indices, DEFAULT_WORKERS, OCR_BATCH_SIZE
+
+    last_progress = [-1]
+
+    def progress_callback(progress):
+        # The callback is also invoked with unchanged values as a cancellation checkpoint, only emit changes
+        if progress != last_progress[0]:
+            last_progress[0] = progress
+            emit("progress", file=pdf_file, progress=progress)
+
+    os.makedirs(output_folder, exist_ok=True)
+    if args.mode == "plans":
+        return create_filtered_pdf(pdf_file, "PLANS", progress_callback,
+                                   workers=args.workers or DEFAULT_WORKERS,
+                                   batch_size=args.batch_size or OCR_BATCH_SIZE,
+                                   output_folder=output_folder, ocr_mode=args.ocr_mode)
+    return create_pdf_between_indices(pdf_file, progress_callback, output_folder=output_folder,
+                                      ocr_mode=args.ocr_mode)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Configured before pdf_processing is imported, its own configure_logging call is then a no-op
+    configure_logging(args.log_level, stream=sys.stderr)
+
+    files = expand_inputs(args.inputs, args.out)
+    if not files:
+        emit("error", message="No input PDFs found", inputs=args.inputs)
+        return EXIT_USAGE
+
+    emit("start", mode=args.mode, files=len(files))
+    failures = 0
+    start_time = time.time()
+    try:
+        for pdf_file, sub_directory in files:
+            file_start = time.time()
+            emit("file_start", file=pdf_file)
+            output_folder = os.path.normpath(os.path.join(args.out, sub_directory))
+            # A PLANS output keeps the input's file name, it cannot be written over the file it is read from
+            if args.mode == "plans" and is_within(os.path.join(output_folder, os.path.basename(pdf_file)), pdf_file):
+                failures += 1
+                emit("file_error", file=pdf_file, message="The filtered PDF would overwrite the input, choose "
+                                                          "another --out")
+                continue
+            try:
+                output = process_file(pdf_file, output_folder, args)
+            except Exception as e:
+                failures += 1
+                logging.error("Error during extraction of %s: %s", pdf_file, e)
+                emit("file_error", file=pdf_file, message=str(e))
+                continue
+
+            if output:
+                summary = load_summary(output) or {}
+                emit("file_done", file=pdf_file, output=output, seconds=round(time.time() - file_start, 3),
+                     stages=summary.get("stages"))
+            else:
+                failures += 1
+                emit("file_error", file=pdf_file, message="No matching pages found")
+    except KeyboardInterrupt:
+        emit("interrupted")
+        return EXIT_INTERRUPTED
+
+    emit("done", files=len(files), failed=failures, seconds=round(time.time() - start_time, 3))
+    return EXIT_FAILURES if failures else EXIT_OK
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
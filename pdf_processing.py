@@ -1,18 +1,29 @@
 import os
 import logging
+import math
+import multiprocessing
 import numpy as np
 import re
+import time
 import cv2
-import easyocr
 import pymupdf
-from PyPDF2 import PdfWriter, PdfReader
-from PIL import Image
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-# Initialize the EasyOCR reader
-easyocr_reader = easyocr.Reader(['en'], gpu=False)
+from PyPDF2 import PdfWriter
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from ocr_engine import get_easyocr_reader, get_ocr_threads, set_ocr_threads, wait_for_prewarm
+from ocr_backends import DEFAULT_OCR_MODE, ocr_mode_backends
+from ocr_cache import OcrResultCache, make_cache_key
+from checkpoints import CheckpointJournal
+from page_index import PageFingerprintIndex, page_fingerprint
+from output_writer import PartialPdfWriter
+from debug_crops import debug_crop_writer, should_capture_crop
+from section_locator import SectionLocator, BEFORE, INSIDE, AFTER
+from layout_probe import pick_number_token, probe_layout
+from instrumentation import file_summary, profiled, timed_stage, write_summary
+from logging_config import configure_logging, set_worker_log_level
+
+# Queue-based logging at PDF_ANALYSER_LOG_LEVEL, unless the importing entry point configured it already
+configure_logging()
 
 
 # Function to get the Desktop folder path
@@ -28,149 +39,690 @@ DESKTOP_FOLDER = get_desktop_folder()
 OUTPUT_FOLDER = os.path.join(DESKTOP_FOLDER, "output")
 PROCESSING_PDFS_FOLDER = os.path.join(DESKTOP_FOLDER, "processing_pdfs")
 CROPPED_IMAGES_FOLDER = os.path.join(DESKTOP_FOLDER, "cropped_images")
+CHECKPOINTS_FOLDER = os.path.join(DESKTOP_FOLDER, "checkpoints")
+PROFILES_FOLDER = os.path.join(DESKTOP_FOLDER, "profiles")
+FINGERPRINTS_FOLDER = os.path.join(DESKTOP_FOLDER, "fingerprints")
 
 # Create directories if they don't exist
 for folder in [OUTPUT_FOLDER, PROCESSING_PDFS_FOLDER, CROPPED_IMAGES_FOLDER]:
     if not os.path.exists(folder):
         os.makedirs(folder)
 
+# Default number of worker processes for page classification in the GUI (1 keeps everything in-process)
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 1) // 2)
+# Upper bound on pages per task sent to a worker, small enough to keep progress updates smooth
+PARALLEL_CHUNK_SIZE = 8
+# Title blocks sent through EasyOCR's detector together, see benchmarks/ocr_batch_benchmark.py for tuning
+OCR_BATCH_SIZE = 8
+
+# A text-layer line has to look like a sheet number (M-101, ME1.1, A2.01) or a spec section number (23 05 00)
+# before it is trusted in place of OCR
+SHEET_NUMBER_PATTERN = re.compile(r'^[A-Z]{1,3}[-.]?\d')
+SECTION_NUMBER_PATTERN = re.compile(r'^\d{2}\s?\d{2}')
+
+# Title blocks are OCR'd at the first zoom and only re-rendered at the next one when no sheet/section number was
+# read with at least OCR_MIN_CONFIDENCE, so large, clean title blocks never pay for a high-resolution render
+TITLE_BLOCK_ZOOMS = (1, 2, 3)
+OCR_MIN_CONFIDENCE = 0.5
+# Fixed zoom used before adaptive rendering, still used for debug crops and the default-box fallback
+TITLE_BLOCK_ZOOM = 2
+
+# Where the layout probe looks for the sheet/section number, as the fraction of the page width and height at which
+# the searched region starts (it always extends to the bottom-right corner)
+LAYOUT_SEARCH_REGIONS = {"PLANS": (0.6, 0.6), "SPECIFICATIONS": (0.0, 0.75)}
+# The searched region is much larger than a title block, the number is the largest text in it so zoom 1 suffices
+LAYOUT_PROBE_ZOOM = 1
+LAYOUT_PROBE_ENABLED = True
+
+# Persistent OCR results keyed by the rendered clip, shared across runs and worker processes
+OCR_CACHE_ENABLED = True
+OCR_CACHE_PATH = os.path.join(DESKTOP_FOLDER, "ocr_cache.sqlite")
+ocr_cache = OcrResultCache(OCR_CACHE_PATH)
+# Bump whenever the title block rendering or preprocess_image changes so stale OCR results are not reused
+PREPROCESSING_VERSION = 3
+
+# Per-page results of unfinished extractions, so re-running the same input resumes instead of starting over
+CHECKPOINTS_ENABLED = True
+# Results of every page classified before in the same project (input folder), keyed by a fingerprint of the page
+# content, so sheets re-issued unchanged in a revision set are not OCR'd again
+FINGERPRINT_INDEX_ENABLED = True
+# Matched pages are appended to <output>.partial.pdf while classifying, so a cancelled or failed run still leaves
+# an openable PDF with everything matched up to that point. Opt-in: a successful run then writes the matched pages
+# twice (the partial chunks and the compact final output), about a quarter more time on large sets
+PARTIAL_OUTPUT_ENABLED = os.getenv("PDF_ANALYSER_PARTIAL_OUTPUT", "0") == "1"
+# Per-stage timings and counts of each extraction are written to <output>.metrics.json (see instrumentation)
+METRICS_SUMMARY_ENABLED = True
+
+# How often the title block text came from the text layer vs. OCR, how many OCR'd pages were settled at the first
+# zoom, how many pixels were rendered and bytes written, and the seconds spent per stage (<stage>_seconds),
+# accumulated over the process lifetime
+title_block_source_stats = Counter()
+
+
+def pipeline_stage(stage):
+    # Time spent in the block goes to title_block_source_stats, see instrumentation.timed_stage
+    return timed_stage(title_block_source_stats, stage)
+
+
+@profiled(PROFILES_FOLDER)
+def create_filtered_pdf(pdf_file, filter_type, progress_callback=None, workers=1, batch_size=OCR_BATCH_SIZE,
+                        output_folder=PROCESSING_PDFS_FOLDER, ocr_mode=DEFAULT_OCR_MODE):
+    logging.info("Starting to create filtered PDF for file: %s with filter type: %s", pdf_file, filter_type)
+    start_time = time.perf_counter()
+    # Fails early on an unknown mode or a missing OCR engine instead of on the first scanned page
+    ocr_mode_backends(ocr_mode)
+
+    # The same PyMuPDF document is used for page counting, rendering and assembling the output
+    document = pymupdf.open(pdf_file)
+    new_pdf_path = os.path.join(output_folder, os.path.basename(pdf_file))
+    logging.info("New filtered PDF will be saved to: %s", new_pdf_path)
+
+    # Sub-directory for the current PDF's debug crops, only created by the writer when crops are enabled
+    pdf_cropped_images_folder = get_cropped_images_folder(pdf_file)
+
+    total_pages = document.page_count
+    stats_before = Counter(title_block_source_stats)
+    journal = open_checkpoint_journal(pdf_file, "plans", {"filter_type": filter_type, "ocr_mode": ocr_mode})
+    # Located once per document, every page is then OCR'd on the tight box around the sheet number
+    layout = detect_title_block_layout(document, filter_type, ocr_mode)
+
+    # Pages seen before in this project are not classified again
+    index = open_fingerprint_index(pdf_file)
+    index_params = fingerprint_index_params("plans", {"filter_type": filter_type, "ocr_mode": ocr_mode}, layout)
+    fingerprints, known_results = [], {}
+    if index:
+        fingerprints, known_results = lookup_fingerprinted_pages(document, index, index_params,
+                                                                 journal.results if journal else {})
+
+    partial_output = PartialPdfWriter(document, new_pdf_path) if PARTIAL_OUTPUT_ENABLED else None
+    if partial_output:
+        partial_output.add({**known_results, **(journal.results if journal else {})})
+
+    try:
+        if workers > 1 and total_pages > 1:
+            matches = classify_pages_parallel(pdf_file, total_pages, filter_type, pdf_cropped_images_folder,
+                                              progress_callback, workers, batch_size, journal, layout, partial_output,
+                                              ocr_mode, known_results)
+        else:
+            matches = classify_pages(document, filter_type, pdf_cropped_images_folder, progress_callback, batch_size,
+                                     journal, layout, partial_output, ocr_mode, known_results)
+    except BaseException:
+        if partial_output:
+            with pipeline_stage("write"):
+                partial_output.finish_partial()
+        raise
+    finally:
+        # Cancelled or crashed runs keep the journal on disk for the next attempt
+        if journal:
+            journal.close()
+
+    if index:
+        index.store({fingerprint: matches[page_num] for page_num, fingerprint in enumerate(fingerprints)
+                     if fingerprint and page_num not in known_results}, index_params)
+        index.close()
+
+    selected_pages = [page_num for page_num, match in enumerate(matches) if match]
+    logging.info("%d of %d pages match and are added to the filtered PDF", len(selected_pages), total_pages)
+    logging.debug("Matched pages: %s", selected_pages)
+
+    # The final output is written in one pass (shared resources stay shared), the partial copy is no longer needed
+    save_pages(document, selected_pages, new_pdf_path)
+    logging.info("Filtered PDF created successfully: %s", new_pdf_path)
+    if journal:
+        journal.discard()
+    if partial_output:
+        title_block_source_stats["bytes_written"] += partial_output.written_bytes
+        partial_output.discard()
+    debug_crop_writer.flush()
+    stats = title_block_source_stats - stats_before
+    log_title_block_source_stats(stats, os.path.basename(pdf_file))
+    record_file_summary(pdf_file, new_pdf_path, stats, total_pages, time.perf_counter() - start_time, workers)
+
+    return new_pdf_path
 
-def create_filtered_pdf(pdf_file, filter_type, progress_callback=None):
-    logging.info(f"Starting to create filtered PDF for file: {pdf_file} with filter type: {filter_type}")
 
-    reader = PdfReader(pdf_file)
-    writer = PdfWriter()
-    new_pdf_path = os.path.join(PROCESSING_PDFS_FOLDER, os.path.basename(pdf_file))
-    logging.info(f"New filtered PDF will be saved to: {new_pdf_path}")
+def record_file_summary(pdf_file, output_path, stats, total_pages, seconds, workers=1):
+    summary = file_summary(pdf_file, output_path, stats, total_pages, seconds, workers)
+    logging.info("%s: %d pages in %.1fs, seconds per stage: %s", os.path.basename(pdf_file), total_pages, seconds,
+                 summary["stages"])
+    if METRICS_SUMMARY_ENABLED and output_path:
+        write_summary(summary, output_path)
+    return summary
 
-    # Create a sub-directory for the current PDF's cropped images
-    pdf_name = os.path.splitext(os.path.basename(pdf_file))[0]
-    pdf_cropped_images_folder = os.path.join(CROPPED_IMAGES_FOLDER, pdf_name)
-    if not os.path.exists(pdf_cropped_images_folder):
-        os.makedirs(pdf_cropped_images_folder)
 
-    document = pymupdf.open(pdf_file)
-    total_pages = len(reader.pages)
+def open_checkpoint_journal(pdf_file, mode, params):
+    """Returns the checkpoint journal of pdf_file for mode, or None when checkpoints are disabled or unavailable."""
+    if not CHECKPOINTS_ENABLED:
+        return None
+    # Results also depend on how title blocks are rendered, journals from before a preprocessing change are stale
+    params = dict(params, preprocessing=PREPROCESSING_VERSION, zooms=list(TITLE_BLOCK_ZOOMS))
+    try:
+        return CheckpointJournal.for_file(CHECKPOINTS_FOLDER, pdf_file, mode, params)
+    except OSError as e:
+        logging.error("Error opening checkpoint journal for %s: %s", pdf_file, e)
+        return None
+
+
+def open_fingerprint_index(pdf_file):
+    """Returns the fingerprint index of pdf_file's project, or None when the index is disabled or unavailable."""
+    if not FINGERPRINT_INDEX_ENABLED:
+        return None
+    try:
+        return PageFingerprintIndex.for_file(FINGERPRINTS_FOLDER, pdf_file)
+    except OSError as e:
+        logging.error("Error opening page fingerprint index for %s: %s", pdf_file, e)
+        return None
+
 
+def fingerprint_index_params(mode, params, layout):
+    # A page's result depends on the same parameters as a journaled one and on where its title block is OCR'd
+    return dict(params, mode=mode, preprocessing=PREPROCESSING_VERSION, zooms=list(TITLE_BLOCK_ZOOMS),
+                layout=list(layout) if layout else None)
+
+
+def lookup_fingerprinted_pages(document, index, params, journaled_results):
+    """Returns (fingerprint per page, {page_num: match} of the pages whose fingerprint index already knows).
+
+    Pages in journaled_results are only fingerprinted, their result is taken from the journal.
+    """
+    stream_digests = {}
+    with pipeline_stage("fingerprint"):
+        fingerprints = [page_fingerprint(document, page_num, stream_digests) for page_num in range(document.page_count)]
+    known = index.lookup([fingerprint for fingerprint in fingerprints if fingerprint], params)
+    known_results = {page_num: known[fingerprint] for page_num, fingerprint in enumerate(fingerprints)
+                     if fingerprint in known and page_num not in journaled_results}
+    title_block_source_stats["pages_fingerprint_reused"] += len(known_results)
+    if known_results:
+        logging.info("Reusing the classification of %d/%d pages seen before in this project", len(known_results),
+                     document.page_count)
+    return fingerprints, known_results
+
+
+def resume_matches(total_pages, journal, known_results=None):
+    """Returns (one bool per page with the journaled and known results filled in, page numbers still to classify).
+
+    known_results is {page_num: match} obtained elsewhere, i.e. from the fingerprint index.
+    """
+    results = dict(known_results or {})
+    if journal:
+        results.update(journal.results)
+        title_block_source_stats["pages_resumed"] += len(journal.results)
+    matches = [False] * total_pages
+    pending_pages = []
     for page_num in range(total_pages):
-        fitz_page = document.load_page(page_num)
-        if image_has_bottom_right_pattern(fitz_page, page_num, pdf_cropped_images_folder, filter_type):
-            writer.add_page(reader.pages[page_num])
-            logging.info(f"Page {page_num} added to filtered PDF.")
+        if page_num in results:
+            matches[page_num] = results[page_num]
         else:
-            logging.info(f"Page {page_num} does not match criteria and will not be added.")
+            pending_pages.append(page_num)
+    if journal and journal.results:
+        logging.info("Resuming classification: %d/%d pages from checkpoint", len(journal.results), total_pages)
+    return matches, pending_pages
+
+
+def record_results(results, journal=None, partial_output=None):
+    # results is {page_num: match} for pages classified since the last call
+    if journal:
+        journal.record(results)
+    if partial_output:
+        # Adding results appends a chunk to the partial output once enough matched pages are collected
+        with pipeline_stage("write"):
+            partial_output.add(results)
+
+
+def save_pages(document, page_numbers, output_path):
+    """Writes the given pages of document, in order, to a new PDF at output_path.
+
+    The document is reduced to those pages in memory, callers must not use it for anything else afterwards.
+    """
+    if not page_numbers:
+        # MuPDF refuses to save a document without pages, keep producing an empty but valid PDF
+        with open(output_path, 'wb') as out_pdf:
+            PdfWriter().write(out_pdf)
+        title_block_source_stats["bytes_written"] += os.path.getsize(output_path)
+        return
+
+    with pipeline_stage("write"):
+        # select() keeps shared resources (fonts, logos, xobjects) shared, unlike copying page runs with insert_pdf
+        document.select(page_numbers)
+        # garbage=1 drops the objects only the removed pages referenced
+        document.save(output_path, garbage=1, deflate=True)
+    title_block_source_stats["bytes_written"] += os.path.getsize(output_path)
+
+
+def get_cropped_images_folder(pdf_file):
+    pdf_name = os.path.splitext(os.path.basename(pdf_file))[0]
+    return os.path.join(CROPPED_IMAGES_FOLDER, pdf_name)
+
+
+def classify_pages(document, filter_type, pdf_cropped_images_folder, progress_callback=None,
+                   batch_size=OCR_BATCH_SIZE, journal=None, layout=None, partial_output=None,
+                   ocr_mode=DEFAULT_OCR_MODE, known_results=None):
+    """Classifies every page in order on the calling thread and returns one bool per page.
+
+    Pages already in journal or known_results are not classified again, every completed batch is appended to
+    the journal and to partial_output.
+    """
+    total_pages = document.page_count
+    matches, pending_pages = resume_matches(total_pages, journal, known_results)
+    completed_pages = total_pages - len(pending_pages)
+
+    for start in range(0, len(pending_pages), batch_size):
+        page_numbers = pending_pages[start:start + batch_size]
+        batch_matches = classify_pages_batched(document, page_numbers, filter_type, pdf_cropped_images_folder,
+                                               batch_size, layout, ocr_mode)
+        for page_num, match in zip(page_numbers, batch_matches):
+            matches[page_num] = match
+        record_results(dict(zip(page_numbers, batch_matches)), journal, partial_output)
+        completed_pages += len(page_numbers)
 
         if progress_callback:
-            progress = int((page_num + 1) / total_pages * 100)
+            progress = int(completed_pages / total_pages * 100)
             progress_callback(progress)
-            logging.info(f"Progress: {progress}%")
+            logging.info("Progress: %d%%", progress)
 
-    with open(new_pdf_path, 'wb') as out_pdf:
-        writer.write(out_pdf)
-    logging.info(f"Filtered PDF created successfully: {new_pdf_path}")
+    return matches
 
-    return new_pdf_path
+
+def classify_pages_parallel(pdf_file, total_pages, filter_type, pdf_cropped_images_folder, progress_callback=None,
+                            workers=DEFAULT_WORKERS, batch_size=OCR_BATCH_SIZE, journal=None, layout=None,
+                            partial_output=None, ocr_mode=DEFAULT_OCR_MODE, known_results=None):
+    """Classifies pages on a pool of worker processes and returns one bool per page, in page order.
+
+    Pages are split into runs of consecutive page numbers. Each worker opens its own copy of the document
+    once and loads its own OCR engine on first use, so nothing heavy crosses the process boundary.
+    Pages already in journal or known_results are skipped; completed chunks are appended to the journal and to
+    partial_output by this (the parent) process.
+    """
+    matches, pending_pages = resume_matches(total_pages, journal, known_results)
+    if not pending_pages:
+        return matches
+
+    workers = min(workers, len(pending_pages))
+    # Several chunks per worker so a slow range (e.g. dense scanned sheets) does not hold up the others
+    chunk_size = max(1, min(max(PARALLEL_CHUNK_SIZE, batch_size), math.ceil(len(pending_pages) / (workers * 4))))
+    chunks = [pending_pages[start:start + chunk_size] for start in range(0, len(pending_pages), chunk_size)]
+    logging.info("Classifying %d pages on %d worker processes in %d chunks", len(pending_pages), workers, len(chunks))
+
+    completed_pages = total_pages - len(pending_pages)
+    last_progress = -1
+
+    wait_for_prewarm(multiprocessing.get_start_method())
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_classify_worker,
+                                   initargs=(pdf_file, _ocr_threads_per_worker(workers), logging.getLogger().level))
+    try:
+        futures = [executor.submit(_classify_page_chunk, page_numbers, filter_type, pdf_cropped_images_folder,
+                                   batch_size, layout, ocr_mode) for page_numbers in chunks]
+        # Chunks finish out of order, results are placed by page number and progress only counts completed pages
+        for future in as_completed(futures):
+            page_numbers, chunk_matches, chunk_stats = future.result()
+            for page_num, match in zip(page_numbers, chunk_matches):
+                matches[page_num] = match
+            record_results(dict(zip(page_numbers, chunk_matches)), journal, partial_output)
+            title_block_source_stats.update(chunk_stats)
+            completed_pages += len(page_numbers)
+
+            progress = int(completed_pages / total_pages * 100)
+            if progress_callback and progress > last_progress:
+                last_progress = progress
+                progress_callback(progress)
+                logging.info("Progress: %d%%", progress)
+    except BaseException:
+        # Cancelled or failed, drop the queued chunks instead of waiting for them
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+
+    return matches
+
+
+def _ocr_threads_per_worker(workers):
+    # Split the cores between worker processes so each OCR engine does not spawn a thread per core. A file
+    # extracted next to others (see extraction_scheduler) only splits its own share of the cores.
+    return max(1, (get_ocr_threads() or os.cpu_count() or 1) // workers)
+
+
+# Per-process state of a classification worker, set up once by _init_classify_worker
+_worker_document = None
+
+
+def _init_classify_worker(pdf_file, ocr_threads, log_level):
+    global _worker_document
+    set_worker_log_level(log_level)
+    set_ocr_threads(ocr_threads)
+    _worker_document = pymupdf.open(pdf_file)
+
+
+def _classify_page_chunk(page_numbers, filter_type, pdf_cropped_images_folder, batch_size, layout, ocr_mode):
+    stats_before = Counter(title_block_source_stats)
+    chunk_matches = classify_pages_batched(_worker_document, page_numbers, filter_type, pdf_cropped_images_folder,
+                                           batch_size, layout, ocr_mode)
+    # Pool workers can exit as soon as the pool shuts down, do not leave crops in the writer queue
+    debug_crop_writer.flush()
+    # The worker's counters live in another process, send this chunk's share back to the parent
+    return page_numbers, chunk_matches, title_block_source_stats - stats_before
 
 
 def preprocess_image(image):
-    # Convert to grayscale
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    # Apply thresholding
-    _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY_INV)
-    # Apply dilation and erosion to remove noise
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-    dilate = cv2.dilate(thresh, kernel, iterations=1)
-    erode = cv2.erode(dilate, kernel, iterations=1)
+    with pipeline_stage("preprocess"):
+        # Convert to grayscale, title blocks are rendered straight to grayscale so this is usually a no-op
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        # Apply thresholding
+        _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY_INV)
+        # Apply dilation and erosion to remove noise
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+        dilate = cv2.dilate(thresh, kernel, iterations=1)
+        erode = cv2.erode(dilate, kernel, iterations=1)
     return erode
 
 
-def image_has_bottom_right_pattern(fitz_page, page_num, pdf_cropped_images_folder, filter_type):
-    logging.info("Checking for image pattern in the page.")
+def pixmap_to_array(pix):
+    """Returns a NumPy view of the pixmap's pixel buffer, no copy is made; pix must outlive the array."""
+    array = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.stride)
+    if pix.n == 1:
+        return array[:, :pix.width]
+    return array[:, :pix.width * pix.n].reshape(pix.height, pix.width, pix.n)
 
+
+def title_block_box(fitz_page, filter_type, layout=None):
+    width, height = fitz_page.rect.width, fitz_page.rect.height
+    if layout:
+        # Tight box found by the layout probe, stored as distances from the bottom-right corner
+        left, top, right, bottom = layout
+        return pymupdf.Rect(width - left, height - top, width - right, height - bottom) & fitz_page.rect
     if filter_type == "PLANS":
-        # Define the region of interest (bottom-right 250x150 pixels)
-        width, height = fitz_page.rect.width, fitz_page.rect.height
-        box = pymupdf.Rect(width - 280, height - 150, width, height)
-    elif filter_type == "SPECIFICATIONS":
-        # Define the region of interest as double the region of width and height
-        width, height = fitz_page.rect.width, fitz_page.rect.height
-        box = pymupdf.Rect(width - 300, height - 200, width, height)
-
-    # Render the selected region to an image at higher resolution
-    zoom = 2  # Adjust zoom to increase resolution
-    mat = pymupdf.Matrix(zoom, zoom)
-    pix = fitz_page.get_pixmap(matrix=mat, clip=box)
-    image = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        # Define the region of interest (bottom-right 280x150 points)
+        return pymupdf.Rect(width - 280, height - 150, width, height)
+    # Define the region of interest as double the region of width and height for specifications
+    return pymupdf.Rect(width - 300, height - 200, width, height)
+
 
-    # Save the cropped image for debugging
-    cropped_image_path = os.path.join(pdf_cropped_images_folder, f"cropped_page_{page_num}.png")
-    image.save(cropped_image_path)
-    logging.info(f"Cropped image saved for debugging: {cropped_image_path}")
+def text_layer_lines(fitz_page, box):
+    """Returns the text lines of the page's text layer inside box, in reading order."""
+    return [text for _, _, _, _, text in text_layer_line_boxes(fitz_page, box)]
 
-    # Convert PIL image to numpy array
-    image_np = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-    preprocessed_black = preprocess_image(image_np)
 
-    # Convert back to PIL images
-    preprocessed_black_pil_image = Image.fromarray(preprocessed_black)
+def text_layer_line_boxes(fitz_page, box):
+    """Returns (x0, y0, x1, y1, text) for each text line of the page's text layer inside box, in reading order."""
+    lines = {}
+    with pipeline_stage("text_layer"):
+        words = fitz_page.get_text("words", clip=box, sort=True)
+    for x0, y0, x1, y1, word, block_no, line_no, _ in words:
+        line = lines.setdefault((block_no, line_no), [x0, y0, x1, y1, []])
+        line[0], line[1], line[2], line[3] = min(line[0], x0), min(line[1], y0), max(line[2], x1), max(line[3], y1)
+        line[4].append(word)
+    return [(x0, y0, x1, y1, ' '.join(words)) for x0, y0, x1, y1, words in lines.values()]
 
-    # Perform OCR with EasyOCR on all processed images
-    ocr_result_preprocessed_black_easyocr = easyocr_reader.readtext(np.array(preprocessed_black_pil_image), detail=0)
 
-    logging.debug(f"OCR result (preprocessed black) with EasyOCR: {ocr_result_preprocessed_black_easyocr}")
+def detect_title_block_layout(document, filter_type, ocr_mode=DEFAULT_OCR_MODE):
+    """Returns the tight title block layout of document (see layout_probe), or None to use the default box."""
+    if not LAYOUT_PROBE_ENABLED:
+        return None
+    pattern = SHEET_NUMBER_PATTERN if filter_type == "PLANS" else SECTION_NUMBER_PATTERN
+    # Locating the number needs a detector that returns line boxes, i.e. EasyOCR; other modes probe the text layer
+    use_ocr = any(backend.name == "easyocr" for backend in ocr_mode_backends(ocr_mode))
+
+    def find_token(page_num):
+        fitz_page = document.load_page(page_num)
+        token_box = pick_number_token(number_token_candidates(fitz_page, filter_type, use_ocr), pattern)
+        if token_box is None:
+            return None
+        return fitz_page.rect.width, fitz_page.rect.height, token_box
+
+    # Rendering, OCR and text layer reads during the probe are counted in their own stages
+    with pipeline_stage("layout_probe"):
+        return probe_layout(document.page_count, find_token)
 
-    # Extract text from EasyOCR results
-    text_preprocessed_black_easyocr = ' '.join(ocr_result_preprocessed_black_easyocr)
-    logging.info(f"Extracted text (preprocessed black) with EasyOCR: {text_preprocessed_black_easyocr}")
 
+def number_token_candidates(fitz_page, filter_type, use_ocr=True):
+    """Returns (x0, y0, x1, y1, text) lines in the layout search region, from the text layer or else from OCR."""
+    width, height = fitz_page.rect.width, fitz_page.rect.height
+    x_fraction, y_fraction = LAYOUT_SEARCH_REGIONS[filter_type if filter_type == "PLANS" else "SPECIFICATIONS"]
+    region = pymupdf.Rect(width * x_fraction, height * y_fraction, width, height)
+
+    lines = text_layer_line_boxes(fitz_page, region)
+    if has_usable_text([text for _, _, _, _, text in lines], filter_type) or not use_ocr:
+        return lines
+
+    pix = render_title_block(fitz_page, region, LAYOUT_PROBE_ZOOM)
+    # A re-run or resume of a scanned set gets the probed lines from the OCR cache, like the title blocks
+    cache_key, cached_lines = lookup_cached_ocr(pix, region, LAYOUT_PROBE_ZOOM, "easyocr_lines")
+    if cached_lines is not None:
+        return [tuple(line) for line in cached_lines]
+
+    preprocessed = preprocess_image(pixmap_to_array(pix))
+    title_block_source_stats["ocr_calls"] += 1
+    with pipeline_stage("ocr"):
+        detail_results = get_easyocr_reader().readtext(preprocessed, detail=1)
+    # EasyOCR boxes are four corner points in pixels of the rendered region, map them back to page coordinates
+    lines = []
+    for points, text, _ in detail_results:
+        xs = [float(point[0]) / LAYOUT_PROBE_ZOOM + region.x0 for point in points]
+        ys = [float(point[1]) / LAYOUT_PROBE_ZOOM + region.y0 for point in points]
+        lines.append((min(xs), min(ys), max(xs), max(ys), text))
+    if cache_key:
+        with pipeline_stage("ocr_cache"):
+            ocr_cache.put(cache_key, lines)
+    return lines
+
+
+def has_usable_text(lines, filter_type):
+    # Only trust the text layer when it holds something shaped like a sheet/section number, otherwise a scanned
+    # sheet with a stray text annotation would be classified without ever being OCR'd
+    pattern = SHEET_NUMBER_PATTERN if filter_type == "PLANS" else SECTION_NUMBER_PATTERN
+    return any(pattern.match(line) for line in lines)
+
+
+def render_title_block(fitz_page, box, zoom=TITLE_BLOCK_ZOOM):
+    # Render the selected region at higher resolution, directly to 8-bit grayscale since that is all OCR needs
+    mat = pymupdf.Matrix(zoom, zoom)
+    with pipeline_stage("render"):
+        pix = fitz_page.get_pixmap(matrix=mat, clip=box, colorspace=pymupdf.csGRAY, alpha=False)
+    title_block_source_stats["rendered_pixels"] += pix.width * pix.height
+    return pix
+
+
+def lookup_cached_ocr(pix, box, zoom, engine):
+    """Returns (cache_key, cached result or None) for a region rendered at zoom and read by engine.
+
+    For title blocks the result is [(text, confidence)], for the layout probe the line boxes it returns.
+    """
+    if not OCR_CACHE_ENABLED:
+        return None, None
+    # Identical clips (re-runs, overlapping addenda sets) reuse the stored OCR result
+    cache_key = make_cache_key(pix.samples_mv, {
+        "zoom": zoom,
+        "box": [box.x0, box.y0, box.x1, box.y1],
+        "preprocessing": PREPROCESSING_VERSION,
+        "engine": engine,
+    })
+    with pipeline_stage("ocr_cache"):
+        cached_results = ocr_cache.get(cache_key)
+    if cached_results is not None:
+        title_block_source_stats["ocr_cache_hit"] += 1
+        logging.debug("Extracted text from OCR cache: %s", cached_results)
+    else:
+        title_block_source_stats["ocr_cache_miss"] += 1
+    return cache_key, cached_results
+
+
+def ocr_is_confident(ocr_results, filter_type):
+    """True when a sheet/section number was read with at least OCR_MIN_CONFIDENCE, i.e. no need to zoom further."""
+    pattern = SHEET_NUMBER_PATTERN if filter_type == "PLANS" else SECTION_NUMBER_PATTERN
+    return any(pattern.match(text) and confidence >= OCR_MIN_CONFIDENCE for text, confidence in ocr_results)
+
+
+def ocr_attempts(fitz_page, box, filter_type, layout, backends):
+    """Returns the (box, zoom, backend) reads to try in order until a number is read confidently.
+
+    Every backend but the last of a cascade gets a single read at the first box and zoom; the last one
+    goes through all zooms (and the default box fallback of a probed layout). Each backend reads the tight box
+    of a layout as a single line and the default box as a whole title block (see OcrBackend.for_box).
+    """
+    if not backends:
+        return []
+    if not layout:
+        renders = [(box, zoom, False) for zoom in TITLE_BLOCK_ZOOMS]
+    else:
+        tight_box = title_block_box(fitz_page, filter_type, layout)
+        # A sheet that does not follow the probed layout still gets the default box at the previous fixed zoom
+        renders = [(tight_box, zoom, True) for zoom in TITLE_BLOCK_ZOOMS] + [(box, TITLE_BLOCK_ZOOM, False)]
+    first_box, first_zoom, first_tight = renders[0]
+    return ([(first_box, first_zoom, backend.for_box(first_tight)) for backend in backends[:-1]]
+            + [(ocr_box, zoom, backends[-1].for_box(tight)) for ocr_box, zoom, tight in renders])
+
+
+def record_ocr_attempt(attempts, attempt, layout):
+    # attempt is the index into attempts (see ocr_attempts) the page was settled at
+    if attempt == 0:
+        title_block_source_stats["ocr_first_pass"] += 1
+    else:
+        title_block_source_stats["ocr_escalated"] += 1
+    title_block_source_stats[f"ocr_settled_{attempts[attempt][2].name}"] += 1
+    if layout and attempt == len(attempts) - 1:
+        title_block_source_stats["layout_fallback"] += 1
+
+
+def capture_debug_crop(fitz_page, box, pix, page_num, pdf_cropped_images_folder, match):
+    # Opt-in (see debug_crops), the crop is written asynchronously by the writer thread
+    if not should_capture_crop(page_num, match):
+        return
+    if pix is None:
+        pix = render_title_block(fitz_page, box)
+    debug_crop_writer.submit(os.path.join(pdf_cropped_images_folder, f"cropped_page_{page_num}.png"), pix)
+
+
+def title_block_matches(texts, filter_type):
     if filter_type == "PLANS":
-        match = any(text.startswith('M') for text in ocr_result_preprocessed_black_easyocr)
-    elif filter_type == "SPECIFICATIONS":
-        match = any(text.startswith('23') for text in ocr_result_preprocessed_black_easyocr)
+        return any(text.startswith('M') for text in texts)
+    return any(text.startswith('23') for text in texts)
+
+
+def read_title_blocks(pages, filter_type, on_read, batch_size=OCR_BATCH_SIZE, layout=None,
+                      ocr_mode=DEFAULT_OCR_MODE):
+    """Reads the title blocks of pages, an iterable of (page_num, fitz_page).
+
+    on_read(index, page_num, fitz_page, box, pix, texts, source) is called once per page, index being its
+    position in pages, as soon as its text is settled; pix is the last render, None when the text layer was
+    used. Pages answered by the text layer or the OCR cache are resolved immediately; the remaining title
+    blocks are rendered and recognized batch_size at a time. A title block without a confident sheet/section
+    number is re-read for its next entry of ocr_attempts (higher zoom or next backend) in a later batch.
+    """
+    pending = []  # (index, page_num, fitz_page, box, attempt, pix, cache_key, preprocessed image)
+    attempts_by_index = {}
+    renders_by_index = {}  # index -> (box, zoom, pix, preprocessed image) of the latest render
+    backends = ocr_mode_backends(ocr_mode)
+
+    def submit(index, page_num, fitz_page, box, attempt):
+        ocr_box, zoom, backend = attempts_by_index[index][attempt]
+        render = renders_by_index.get(index)
+        # A cascade reads the first render with several backends, it is rendered and preprocessed once
+        if render is None or render[:2] != (ocr_box, zoom):
+            pix = render_title_block(fitz_page, ocr_box, zoom)
+            render = renders_by_index[index] = (ocr_box, zoom, pix, None)
+        pix = render[2]
+        cache_key, cached_results = lookup_cached_ocr(pix, ocr_box, zoom, backend.name)
+        if cached_results is not None:
+            settle(index, page_num, fitz_page, box, attempt, pix, cached_results)
+            return
+        if render[3] is None:
+            render = renders_by_index[index] = render[:3] + (preprocess_image(pixmap_to_array(pix)),)
+        pending.append((index, page_num, fitz_page, box, attempt, pix, cache_key, render[3]))
+
+    def settle(index, page_num, fitz_page, box, attempt, pix, ocr_results):
+        attempts = attempts_by_index[index]
+        if attempt + 1 < len(attempts) and not ocr_is_confident(ocr_results, filter_type):
+            logging.debug("Page %d title block not read confidently by %s at zoom %s: %s", page_num,
+                          attempts[attempt][2].name, attempts[attempt][1], ocr_results)
+            submit(index, page_num, fitz_page, box, attempt + 1)
+            return
+        record_ocr_attempt(attempts, attempt, layout)
+        renders_by_index.pop(index, None)
+        source = f"{attempts[attempt][2].name} at zoom {attempts[attempt][1]}"
+        on_read(index, page_num, fitz_page, box, pix, [text for text, _ in ocr_results], source)
+
+    def run_pending():
+        batch = pending[:]
+        # Escalated title blocks are queued again while the batch is settled
+        pending.clear()
+        # Each backend recognizes its share of the batch in one call
+        batch_results = [None] * len(batch)
+        by_backend = {}
+        for position, item in enumerate(batch):
+            by_backend.setdefault(attempts_by_index[item[0]][item[4]][2], []).append(position)
+        for backend, positions in by_backend.items():
+            title_block_source_stats["ocr_calls"] += len(positions)
+            with pipeline_stage("ocr"):
+                backend_results = backend.recognize_batch([batch[p][7] for p in positions])
+            for position, ocr_results in zip(positions, backend_results):
+                batch_results[position] = ocr_results
+
+        for (index, page_num, fitz_page, box, attempt, pix, cache_key, _), ocr_results in zip(batch, batch_results):
+            if cache_key:
+                with pipeline_stage("ocr_cache"):
+                    ocr_cache.put(cache_key, ocr_results)
+            settle(index, page_num, fitz_page, box, attempt, pix, ocr_results)
+
+    for index, (page_num, fitz_page) in enumerate(pages):
+        box = title_block_box(fitz_page, filter_type)
+
+        texts = text_layer_lines(fitz_page, box)
+        if has_usable_text(texts, filter_type):
+            title_block_source_stats["text_layer"] += 1
+            on_read(index, page_num, fitz_page, box, None, texts, "text layer")
+            continue
 
-    logging.info(f"OCR pattern found with EasyOCR: {match}")
+        if not backends:
+            # Text layer only job, a page without a usable text layer stays unread
+            title_block_source_stats["text_layer_unread"] += 1
+            on_read(index, page_num, fitz_page, box, None, texts, "text layer (unusable, no OCR)")
+            continue
 
-    return match
+        title_block_source_stats["ocr"] += 1
+        attempts_by_index[index] = ocr_attempts(fitz_page, box, filter_type, layout, backends)
+        submit(index, page_num, fitz_page, box, 0)
+        if len(pending) >= batch_size:
+            run_pending()
 
+    while pending:
+        run_pending()
 
-def spec_image_has_bottom_right_pattern(fitz_page, page_num, pdf_cropped_images_folder):
-    logging.info("Checking for image pattern in the page.")
 
-    # Define the region of interest as double the region of width and height for specifications
-    width, height = fitz_page.rect.width, fitz_page.rect.height
-    box = pymupdf.Rect(width - 300, height - 200, width, height)
+def classify_pages_batched(document, page_numbers, filter_type, pdf_cropped_images_folder, batch_size=OCR_BATCH_SIZE,
+                           layout=None, ocr_mode=DEFAULT_OCR_MODE):
+    """Returns one bool per entry of page_numbers, whether its title block matches filter_type (read_title_blocks)."""
+    matches = [False] * len(page_numbers)
 
-    # Render the selected region to an image at higher resolution
-    zoom = 2  # Adjust zoom to increase resolution
-    mat = pymupdf.Matrix(zoom, zoom)
-    pix = fitz_page.get_pixmap(matrix=mat, clip=box)
-    image = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    def on_read(index, page_num, fitz_page, box, pix, texts, source):
+        matches[index] = title_block_matches(texts, filter_type)
+        # The one line per page at INFO, how the title block was read is only logged at DEBUG
+        logging.info("Page %d title block %s from %s, pattern found: %s", page_num, texts, source, matches[index])
+        capture_debug_crop(fitz_page, box, pix, page_num, pdf_cropped_images_folder, matches[index])
 
-    # Save the cropped image for debugging
-    cropped_image_path = os.path.join(pdf_cropped_images_folder, f"cropped_page_{page_num}.png")
-    image.save(cropped_image_path)
-    logging.info(f"Cropped image saved for debugging: {cropped_image_path}")
+    # Pages are loaded as the reader gets to them, only the ones waiting for OCR are held
+    read_title_blocks(((page_num, document.load_page(page_num)) for page_num in page_numbers), filter_type, on_read,
+                      batch_size, layout, ocr_mode)
+    return matches
 
-    # Convert PIL image to numpy array
-    image_np = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-    preprocessed_black = preprocess_image(image_np)
 
-    # Convert back to PIL images
-    preprocessed_black_pil_image = Image.fromarray(preprocessed_black)
+def read_title_block(fitz_page, page_num, filter_type, layout=None, ocr_mode=DEFAULT_OCR_MODE):
+    """Reads a single title block like read_title_blocks, returns (box, pix, texts, source)."""
+    results = []
 
-    # Perform OCR with EasyOCR on all processed images
-    ocr_result_preprocessed_black_easyocr = easyocr_reader.readtext(np.array(preprocessed_black_pil_image), detail=0)
+    def on_read(index, page_num, fitz_page, box, pix, texts, source):
+        results.append((box, pix, texts, source))
 
-    logging.debug(f"OCR result (preprocessed black) with EasyOCR: {ocr_result_preprocessed_black_easyocr}")
+    read_title_blocks([(page_num, fitz_page)], filter_type, on_read, layout=layout, ocr_mode=ocr_mode)
+    return results[0]
 
-    # Extract text from EasyOCR results and log it
-    text_preprocessed_black_easyocr = ' '.join(ocr_result_preprocessed_black_easyocr)
-    logging.info(f"Extracted text (preprocessed black) with EasyOCR: {text_preprocessed_black_easyocr}")
+
+def spec_image_has_bottom_right_pattern(fitz_page, page_num, pdf_cropped_images_folder, layout=None,
+                                        ocr_mode=DEFAULT_OCR_MODE):
+    box, pix, texts, source = read_title_block(fitz_page, page_num, "SPECIFICATIONS", layout, ocr_mode)
 
     match = False
     match_text = ""
-    for text in ocr_result_preprocessed_black_easyocr:
-        logging.info(f"Checking text: {text}")
+    for text in texts:
+        logging.debug("Checking text: %s", text)
 
         if text.startswith('2'):
             match_text = text
@@ -179,139 +731,144 @@ def spec_image_has_bottom_right_pattern(fitz_page, page_num, pdf_cropped_images_
         if text.startswith('23'):
             match = True
             match_text = text
-            logging.info("Match found: Text starts with '23'")
+            logging.debug("Match found: Text starts with '23'")
             break
 
+    if not match_text:
+        # No division 2x number, fall back to any section number (00 01 10, 31 00 00) so pages of other divisions
+        # still tell the search which side of division 23 they are on
+        match_text = next((text for text in texts if SECTION_NUMBER_PATTERN.match(text)), "")
+
     try:
         # Take only the first two characters to check if it's smaller than 23
         number = int(match_text[:2])
         smaller = number < 23
-        logging.info(f"Extracted number: {number}, smaller: {smaller}")
+        logging.debug("Extracted number: %d, smaller: %s", number, smaller)
     except ValueError:
-        logging.error(f"Failed to convert {match_text[:2]} to int.")
+        # An unreadable section number is expected on cover and divider pages, it is part of the page summary
+        logging.debug("Failed to convert %r to int.", match_text[:2])
         smaller = None
 
-    logging.info(f"OCR pattern found with EasyOCR: {match}, smaller: {smaller}")
-
-    # Delete the cropped image after processing
-    try:
-        os.remove(cropped_image_path)
-        logging.info(f"Cropped image deleted: {cropped_image_path}")
-    except Exception as e:
-        logging.error(f"Error deleting cropped image: {cropped_image_path}. Error: {e}")
+    logging.info("Page %d title block %s from %s, pattern found: %s, smaller: %s", page_num, texts, source, match,
+                 smaller)
+    capture_debug_crop(fitz_page, box, pix, page_num, pdf_cropped_images_folder, match)
 
     return match, smaller
 
 
-def create_pdf_between_indices(pdf_file, progress_callback=None):
-    logging.info(f"Starting to create PDF between indices for file: {pdf_file}")
+def log_title_block_source_stats(stats, label):
+    total = stats["text_layer"] + stats["ocr"] + stats["text_layer_unread"]
+    if total:
+        logging.info("%s: title block read from text layer on %d/%d pages, OCR on %d/%d pages (%.0f%% of OCR calls "
+                     "avoided)", label, stats["text_layer"], total, stats["ocr"], total,
+                     stats["text_layer"] / total * 100)
+    if stats["ocr"]:
+        logging.info("%s: OCR cache hits %d, misses %d", label, stats["ocr_cache_hit"], stats["ocr_cache_miss"])
+        logging.info("%s: title block settled at the first zoom on %d/%d OCR'd pages (%.0f%% first-pass hit rate), "
+                     "%d re-read at a higher zoom or by the next OCR backend", label, stats["ocr_first_pass"],
+                     stats["ocr"], stats["ocr_first_pass"] / stats["ocr"] * 100, stats["ocr_escalated"])
+        settled = ', '.join(f"{key[len('ocr_settled_'):]} {count}" for key, count in sorted(stats.items())
+                            if key.startswith('ocr_settled_'))
+        logging.info("%s: title block settled by OCR backend: %s", label, settled)
+    if stats["text_layer_unread"]:
+        logging.info("%s: %d pages without a usable text layer were not OCR'd", label, stats["text_layer_unread"])
+    if total:
+        logging.info("%s: %.0f title block pixels rendered per page", label, stats["rendered_pixels"] / total)
+    if stats["layout_fallback"]:
+        logging.info("%s: %d pages fell back from the probed layout to the default box", label,
+                     stats["layout_fallback"])
+
+
+@profiled(PROFILES_FOLDER)
+def create_pdf_between_indices(pdf_file, progress_callback=None, output_folder=PROCESSING_PDFS_FOLDER,
+                               ocr_mode=DEFAULT_OCR_MODE):
+    logging.info("Starting to create PDF between indices for file: %s", pdf_file)
+    start_time = time.perf_counter()
+    ocr_mode_backends(ocr_mode)
 
     # Load the PDF and initialize variables
-    reader = PdfReader(pdf_file)
-    total_pages = len(reader.pages)
     fitz_document = pymupdf.open(pdf_file)
-    logging.info(f"Total pages in the PDF: {total_pages}")
-
-    first_index = 0
-    last_index = total_pages - 1
-
-    # Perform binary search to find the first matching index
-    first_match_index = binary_search_from_top(fitz_document, total_pages, 0)
-
-    if first_match_index == 0:
+    total_pages = fitz_document.page_count
+    logging.info("Total pages in the PDF: %d", total_pages)
+    stats_before = Counter(title_block_source_stats)
+    pdf_cropped_images_folder = get_cropped_images_folder(pdf_file)
+
+    journal = open_checkpoint_journal(pdf_file, "specs", {"ocr_mode": ocr_mode})
+    layout = detect_title_block_layout(fitz_document, "SPECIFICATIONS", ocr_mode)
+    index = open_fingerprint_index(pdf_file)
+    index_params = fingerprint_index_params("specs", {"ocr_mode": ocr_mode}, layout)
+    stream_digests = {}
+
+    def classify(page_num):
+        # The search only probes a few pages, they are fingerprinted and looked up one at a time
+        fingerprint = None
+        if index:
+            with pipeline_stage("fingerprint"):
+                fingerprint = page_fingerprint(fitz_document, page_num, stream_digests)
+        known = index.lookup([fingerprint], index_params) if fingerprint else {}
+        if fingerprint in known:
+            title_block_source_stats["pages_fingerprint_reused"] += 1
+            position = known[fingerprint]
+        else:
+            position = spec_page_position(fitz_document, page_num, pdf_cropped_images_folder, layout, ocr_mode)
+            if fingerprint:
+                index.store({fingerprint: position}, index_params)
+        if journal:
+            journal.record({page_num: position})
+        return position
+
+    # Binary search for a '23' page, then galloping search for the pages around the section
+    locator = SectionLocator(total_pages, classify, progress_callback,
+                             known_positions=journal.results if journal else None)
+    try:
+        section_range = locator.locate()
+    finally:
+        # Cancelled or crashed runs keep the journal on disk for the next attempt
+        if journal:
+            journal.close()
+        if index:
+            index.close()
+    logging.info("%s: %d OCR probes for %d pages", os.path.basename(pdf_file), locator.probes, total_pages)
+
+    if section_range is None:
         logging.error("No matching page found.")
+        if journal:
+            journal.discard()
+        # Nothing was written, the summary is only logged
+        record_file_summary(pdf_file, None, title_block_source_stats - stats_before, total_pages,
+                            time.perf_counter() - start_time)
         return None
 
-    logging.info(f"First matching page index with '23' pattern: {first_match_index}")
-
-    # Add pages upward from first_match_index until a page with a smaller number than '23' is found
-    for page_num in range(first_match_index, -1, -1):
-        fitz_page = fitz_document.load_page(page_num)
-        match, smaller = spec_image_has_bottom_right_pattern(fitz_page, page_num, '')
-
-        if match:
-            logging.info(f"Page {page_num} match - '23'")
-            first_index = page_num
-        elif smaller is None:
-            logging.info(f"Page {page_num} has an undefined 'smaller' value, skipping page.")
-            continue
-        elif smaller:
-            first_index = page_num
-            logging.info(f"Page {page_num} has a smaller value, stopping upward search.")
-            break
-
-        # Update progress during upward processing
-        if progress_callback:
-            progress = int((first_match_index - page_num + 1) / total_pages * 50)  # First half (0-50%)
-            progress_callback(progress)
-            logging.info(f"Progress: {progress}% (Upward)")
-
-    # Add pages from first_match_index downwards until a page with a number greater than or equal to '23' is found
-    for page_num in range(first_match_index + 1, total_pages):
-        fitz_page = fitz_document.load_page(page_num)
-        match, smaller = spec_image_has_bottom_right_pattern(fitz_page, page_num, '')
-
-        if match:
-            logging.info(f"Page {page_num} match - '23'")
-            last_index = page_num
-        elif smaller is None:
-            logging.info(f"Page {page_num} has an undefined 'smaller' value, skipping page.")
-            continue
-        elif not smaller:
-            last_index = page_num
-            logging.info(f"Page {page_num} has a smaller value, stopping downward search.")
-            break
-
-        # Update progress during downward processing
-        if progress_callback:
-            progress = int(50 + (page_num - first_match_index) / total_pages * 50)  # Second half (50-100%)
-            progress_callback(progress)
-            logging.info(f"Progress: {progress}% (Downward)")
+    first_index, last_index = section_range
 
     # Create a new PDF with pages from first_index to last_index
-    new_pdf_path = os.path.join(PROCESSING_PDFS_FOLDER,
+    new_pdf_path = os.path.join(output_folder,
                                 f"{os.path.splitext(os.path.basename(pdf_file))[0]}_filtered_range.pdf")
-    logging.info(f"New filtered PDF will be saved to: {new_pdf_path}")
-
-    writer = PdfWriter()
-    for page_num in range(first_index, last_index + 1):
-        writer.add_page(reader.pages[page_num])
+    logging.info("New filtered PDF will be saved to: %s", new_pdf_path)
 
     # Write the final filtered PDF
-    with open(new_pdf_path, 'wb') as out_pdf:
-        writer.write(out_pdf)
-    logging.info(f"Filtered PDF created successfully from pages {first_index} to {last_index}: {new_pdf_path}")
-
-    progress_callback(100)
+    save_pages(fitz_document, list(range(first_index, last_index + 1)), new_pdf_path)
+    logging.info("Filtered PDF created successfully from pages %d to %d: %s", first_index, last_index, new_pdf_path)
+    if journal:
+        journal.discard()
+    debug_crop_writer.flush()
+    stats = title_block_source_stats - stats_before
+    log_title_block_source_stats(stats, os.path.basename(pdf_file))
+    record_file_summary(pdf_file, new_pdf_path, stats, total_pages, time.perf_counter() - start_time)
+
+    if progress_callback:
+        progress_callback(100)
 
     return new_pdf_path
 
 
-def binary_search_from_top(fitz_document, total_pages, first_index):
-    """Performs a binary search to find the first page matching the '23' pattern from the top."""
-    low = first_index
-    high = total_pages - 1
-    found_index = -1  # Initialize with an invalid index
-
-    while low <= high:
-        mid = (low + high) // 2
-        logging.info(f"binary_search_from_top -> Low: {low}, High: {high}, Mid: {mid}, Found Index: {found_index}")
-
-        fitz_page = fitz_document.load_page(mid)
-        match, smaller = spec_image_has_bottom_right_pattern(fitz_page, mid, '')
-
-        if match:
-            # If we find a match, we update the found_index and continue searching in the lower half
-            found_index = mid
-            return mid
-
-        if smaller:
-            low = mid + 1  # Continue searching from the current index upwards
-        elif not smaller:
-            high = mid - 1
-        elif smaller is None:
-            low = low + 1
-
-    logging.info(
-        f"binary_search_from_top Final Found Index from top: {found_index}, returning: {found_index if found_index != -1 else first_index}")
-    return found_index if found_index != -1 else first_index  # Return found_index or the initial index if not found
+def spec_page_position(fitz_document, page_num, pdf_cropped_images_folder, layout=None, ocr_mode=DEFAULT_OCR_MODE):
+    """Classifies a page relative to division 23 for SectionLocator, None when the section number is unreadable."""
+    fitz_page = fitz_document.load_page(page_num)
+    match, smaller = spec_image_has_bottom_right_pattern(fitz_page, page_num, pdf_cropped_images_folder, layout,
+                                                         ocr_mode)
+    if match:
+        return INSIDE
+    if smaller is None:
+        return None
+    return BEFORE if smaller else AFTER
@@ -1,95 +1,293 @@
 import cv2
+import numpy as np
 import pytesseract
-from PIL import Image
 import pymupdf  # PyMuPDF
 import logging
 import pandas as pd
-import re
 import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from schedule_extraction import contains_schedule_title, iter_pool_results
+
+# Default zoom of render_page_image, PyMuPDF's 72 dpi
+SCHEDULE_RENDER_ZOOM = 1
+# Table cells and titles are rendered for OCR at 216 dpi, schedule text is small
+CELL_OCR_ZOOM = 3
+# Table rows OCR'd per image_to_data call, and calls run at once per page
+CELL_OCR_BATCH_ROWS = 20
+CELL_OCR_THREADS = 2
+# Sparse text: words are placed in cells by their boxes, Tesseract does not have to find the reading order
+CELL_OCR_CONFIG = "--psm 11"
+# Table detection runs on a render downsampled to this many pixels on the longer side, ruling lines survive it
+GRID_DETECTION_MAX_SIDE = 1200
+# A ruling line is at least 1/GRID_LINE_DIVISOR of the image width (horizontal) or height (vertical)
+GRID_LINE_DIVISOR = 40
+# Share of a table's width (height) a horizontal (vertical) line must cover to be a row (column) edge; text
+# strokes left in the line masks of a scanned render are much shorter
+GRID_EDGE_COVERAGE = 0.5
+# Line crossings a grid needs to count as a table, 3 x 3 for the smallest table of 2 x 2 cells
+MIN_GRID_JOINTS = 9
+# Smallest table width and height, in detection pixels
+MIN_TABLE_PIXELS = 30
+# Band above a table, in points, where a schedule's title sits
+TABLE_TITLE_BAND = 48
+# Pages per task sent to a worker process by extract_schedule_tables
+SCHEDULE_CHUNK_PAGES = 4
 
 
 def ocr_image(image):
     return pytesseract.image_to_string(image)
 
 
-def contains_schedule_title(text):
-    return re.search(r'schedule', text, re.IGNORECASE) is not None
+def ruling_lines(image):
+    """Returns the (horizontal, vertical) ruling line masks of a grayscale page image.
 
+    Each direction is pulled out with a morphological opening, so text, logos and hatching drop out.
+    """
+    height, width = image.shape
+    # Dark lines on a light page, thresholded against the local background so faint thin lines survive
+    binary = cv2.adaptiveThreshold(cv2.bitwise_not(image), 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 15, -2)
+    horizontal = cv2.morphologyEx(binary, cv2.MORPH_OPEN,
+                                  cv2.getStructuringElement(cv2.MORPH_RECT, (max(width // GRID_LINE_DIVISOR, 2), 1)))
+    vertical = cv2.morphologyEx(binary, cv2.MORPH_OPEN,
+                                cv2.getStructuringElement(cv2.MORPH_RECT, (1, max(height // GRID_LINE_DIVISOR, 2))))
+    return horizontal, vertical
 
-def detect_tables_in_image(image_path):
-    image = cv2.imread(image_path, 0)  # Read the image in grayscale
-    blur = cv2.GaussianBlur(image, (5, 5), 0)
-    _, thresh = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
 
-    # Find contours
-    contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+def table_regions(horizontal, vertical):
+    """Returns the (x0, y0, x1, y1) pixel boxes of the tables formed by ruling line masks, top to bottom.
 
-    # Filter out contours that do not resemble a table structure
-    for contour in contours:
-        x, y, w, h = cv2.boundingRect(contour)
-        if w > 50 and h > 50:  # Adjust these dimensions as needed for your table size
-            return True  # A table-like structure is detected
-    return False
+    Lines that touch form one grid; a grid counts as a table when its lines cross at least MIN_GRID_JOINTS
+    times (2 x 2 cells), which a sheet border, a boxed title block or a logo never do.
+    """
+    # Closes the pixel gaps left where the two line directions meet
+    grid = cv2.dilate(cv2.bitwise_or(horizontal, vertical), np.ones((3, 3), np.uint8))
+    joints = cv2.bitwise_and(cv2.dilate(horizontal, np.ones((3, 3), np.uint8)),
+                             cv2.dilate(vertical, np.ones((3, 3), np.uint8)))
 
+    grid_count, grid_labels, stats, _ = cv2.connectedComponentsWithStats(grid, connectivity=8)
+    joint_count, joint_labels = cv2.connectedComponents(joints, connectivity=8)
+    if grid_count <= 1 or joint_count <= 1:
+        return []
+    # Every joint lies on exactly one grid, count the distinct joints of each grid
+    on_joint = joint_labels > 0
+    joint_grid = np.unique(np.stack([joint_labels[on_joint], grid_labels[on_joint]]), axis=1)[1]
+    joints_per_grid = np.bincount(joint_grid, minlength=grid_count)
 
-def extract_tables_from_image_text(text):
-    tables = []
-    lines = text.split('\n')
-    table = []
-    for line in lines:
-        if contains_schedule_title(line):
-            table.append(line)
-        elif table:
-            tables.append(table)
-            table = []
-    if table:
-        tables.append(table)
+    x, y, w, h = (stats[:, index] for index in (cv2.CC_STAT_LEFT, cv2.CC_STAT_TOP, cv2.CC_STAT_WIDTH,
+                                                cv2.CC_STAT_HEIGHT))
+    is_table = (joints_per_grid >= MIN_GRID_JOINTS) & (w >= MIN_TABLE_PIXELS) & (h >= MIN_TABLE_PIXELS)
+    is_table[0] = False  # label 0 is the background
+    return sorted((int(x[label]), int(y[label]), int(x[label] + w[label]), int(y[label] + h[label]))
+                  for label in np.flatnonzero(is_table))
 
-    extracted_tables = []
-    for table in tables:
-        table_df = pd.DataFrame([x.split() for x in table])
-        extracted_tables.append(table_df)
-    return extracted_tables
 
+def detect_table_regions(image):
+    """Returns the (x0, y0, x1, y1) pixel boxes of the ruled tables in a grayscale page image, top to bottom."""
+    return table_regions(*ruling_lines(image))
 
-def process_image_based_page(pdf_file, page_num):
+
+def detect_tables_in_image(image):
+    """True when the grayscale page image holds a ruled table."""
+    return bool(detect_table_regions(image))
+
+
+def line_positions(has_line):
+    """Returns the centers of the runs of True in has_line, i.e. where the ruling lines crossing an axis are."""
+    indices = np.flatnonzero(has_line)
+    if not len(indices):
+        return np.empty(0)
+    breaks = np.flatnonzero(np.diff(indices) > 1)
+    starts = indices[np.concatenate(([0], breaks + 1))]
+    ends = indices[np.concatenate((breaks, [len(indices) - 1]))]
+    return (starts + ends) / 2
+
+
+def render_page_image(page, zoom=SCHEDULE_RENDER_ZOOM, clip=None):
+    """Renders the page (or the clip rectangle of it) straight to a grayscale NumPy array, the only form
+    detection and OCR need."""
+    pix = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), colorspace=pymupdf.csGRAY, clip=clip)
+    # Copied out of the pixmap so the array does not depend on it staying alive
+    return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
+
+
+def page_table_grids(page):
+    """Returns [(row_edges, column_edges)] of the ruled tables on a page, in page coordinates.
+
+    Tables and their lines are found on a downsampled render; a table of n rows has n + 1 row edges, its
+    outer border included.
+    """
+    zoom = min(1.0, GRID_DETECTION_MAX_SIDE / max(page.rect.width, page.rect.height))
+    horizontal, vertical = ruling_lines(render_page_image(page, zoom))
+    grids = []
+    for x0, y0, x1, y1 in table_regions(horizontal, vertical):
+        row_cover = np.count_nonzero(horizontal[y0:y1, x0:x1], axis=1)
+        column_cover = np.count_nonzero(vertical[y0:y1, x0:x1], axis=0)
+        row_edges = (line_positions(row_cover >= GRID_EDGE_COVERAGE * (x1 - x0)) + y0) / zoom
+        column_edges = (line_positions(column_cover >= GRID_EDGE_COVERAGE * (y1 - y0)) + x0) / zoom
+        if len(row_edges) >= 2 and len(column_edges) >= 2:
+            grids.append((row_edges, column_edges))
+    return grids
+
+
+def grid_rect(grid):
+    row_edges, column_edges = grid
+    return pymupdf.Rect(column_edges[0], row_edges[0], column_edges[-1], row_edges[-1])
+
+
+def page_table_regions(page):
+    """Returns the page rectangles of the ruled tables on a page."""
+    return [grid_rect(grid) for grid in page_table_grids(page)]
+
+
+def ocr_words(image):
+    """Returns the words Tesseract finds in image as a DataFrame of text, left, top, width, height (pixels)."""
+    data = pytesseract.image_to_data(image, config=CELL_OCR_CONFIG, output_type=pytesseract.Output.DICT)
+    words = pd.DataFrame({key: data[key] for key in ("text", "left", "top", "width", "height", "conf")})
+    words["text"] = words["text"].astype(str).str.strip()
+    # Entries of blocks, paragraphs and lines have a confidence of -1 and no text
+    return words[(words["text"] != "") & (pd.to_numeric(words["conf"]) >= 0)]
+
+
+def band_cells(image, clip, row_edges, column_edges):
+    """OCRs one horizontal band of a table, rendered to image from the clip rectangle.
+
+    Returns a DataFrame with a row per table row of the band (len(row_edges) - 1) and a column per table
+    column, each cell holding the words whose centers fall into it, in reading order.
+    """
+    words = ocr_words(image)
+    zoom = image.shape[1] / clip.width
+    center_x = clip.x0 + (words["left"] + words["width"] / 2) / zoom
+    center_y = clip.y0 + (words["top"] + words["height"] / 2) / zoom
+    words = words.assign(row=np.searchsorted(row_edges, center_y) - 1,
+                         column=np.searchsorted(column_edges, center_x) - 1)
+    # Words outside the outer border belong to no cell
+    words = words[(words["row"] >= 0) & (words["row"] < len(row_edges) - 1)
+                  & (words["column"] >= 0) & (words["column"] < len(column_edges) - 1)]
+    cells = (words.sort_values(["row", "column", "top", "left"])
+             .groupby(["row", "column"])["text"].agg(" ".join)
+             .unstack("column").rename_axis(columns=None))
+    return cells.reindex(index=range(len(row_edges) - 1), columns=range(len(column_edges) - 1)).fillna("")
+
+
+def iter_table_rows(page, grid, threads=CELL_OCR_THREADS):
+    """Yields the rows of a ruled table as DataFrames of up to CELL_OCR_BATCH_ROWS rows, top to bottom.
+
+    Each batch of rows is rendered on its own and OCR'd with one image_to_data call, up to threads batches
+    at a time; Tesseract runs as a subprocess, so threads are enough to keep several busy. Rendering stays
+    on the calling thread (a PyMuPDF page is not thread-safe) and at most threads rendered batches are
+    held at once, so memory stays bounded however large the sheet.
+    """
+    row_edges, column_edges = grid
+    rows = len(row_edges) - 1
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for first in range(0, rows, CELL_OCR_BATCH_ROWS):
+            last = min(first + CELL_OCR_BATCH_ROWS, rows)
+            clip = pymupdf.Rect(column_edges[0], row_edges[first], column_edges[-1], row_edges[last])
+            image = render_page_image(page, CELL_OCR_ZOOM, clip)
+            pending.append((first, executor.submit(band_cells, image, clip, row_edges[first:last + 1],
+                                                   column_edges)))
+            if len(pending) >= threads:
+                first_row, batch = pending.popleft()
+                yield batch.result().set_axis(range(first_row, first_row + len(batch.result())))
+        while pending:
+            first_row, batch = pending.popleft()
+            yield batch.result().set_axis(range(first_row, first_row + len(batch.result())))
+
+
+def table_title_text(page, grid):
+    """OCRs the band above a table, where a schedule's title sits."""
+    region = grid_rect(grid)
+    clip = pymupdf.Rect(region.x0, region.y0 - TABLE_TITLE_BAND, region.x1, region.y0) & page.rect
+    if clip.is_empty:
+        return ""
+    return ocr_image(render_page_image(page, CELL_OCR_ZOOM, clip))
+
+
+def page_schedule_tables(page, page_num, threads=CELL_OCR_THREADS):
+    """Returns [(DataFrame, title)] of the schedule tables OCR'd from one loaded page.
+
+    Every ruled table is read cell by cell into a DataFrame with a row per table row and a column per table
+    column, the header row included as Camelot returns it. A table is a schedule when the band above it
+    (its title) or its cells mention one. A page without a ruled table is not OCR'd at all.
+    """
     try:
-        document = pymupdf.open(pdf_file)
-        page = document.load_page(page_num)
-        pix = page.get_pixmap()
-        image_path = f"page_{page_num}.png"
-        pix.save(image_path)
-
-        if detect_tables_in_image(image_path):
-            logging.info(f"Page {page_num + 1} is image-based and contains a table structure.")
-            image = Image.open(image_path)
-            ocr_text = ocr_image(image)
-            extracted_tables = extract_tables_from_image_text(ocr_text)
-
-            table_titles = []
-            for table_num, table in enumerate(extracted_tables):
-                table_titles.append(f"Table {table_num + 1} on Page {page_num + 1}")
-            return extracted_tables, table_titles
-        else:
-            logging.info(f"Page {page_num + 1} is image-based but does not contain table structures.")
-            return [], []
+        grids = page_table_grids(page)
+        if not grids:
+            logging.info("Page %d is image-based but does not contain table structures.", page_num + 1)
+            return []
+        logging.info("Page %d is image-based and contains %d table structures.", page_num + 1, len(grids))
+        extracted_tables = []
+        for table_num, grid in enumerate(grids):
+            start = time.perf_counter()
+            table = pd.concat(list(iter_table_rows(page, grid, threads)))
+            logging.debug("Table %d on Page %d: %d cells OCR'd in %.2fs", table_num + 1, page_num + 1, table.size,
+                          time.perf_counter() - start)
+            if contains_schedule_title(table_title_text(page, grid)) \
+                    or contains_schedule_title(table.to_string(index=False)):
+                extracted_tables.append((table, f"Table {table_num + 1} on Page {page_num + 1}"))
+        return extracted_tables
     except Exception as e:
-        logging.error(f"Error processing page {page_num + 1}: {e}")
-        return [], []
-    finally:
-        if os.path.exists(image_path):
-            os.remove(image_path)
+        logging.error("Error processing page %d: %s", page_num + 1, e)
+        return []
+
+
+def process_image_based_page(pdf_file, page_num):
+    """Single-page entry point, extract_schedule_tables should be used for more than one page of a document."""
+    with pymupdf.open(pdf_file) as document:
+        tables = page_schedule_tables(document.load_page(page_num), page_num)
+    return [table for table, _ in tables], [title for _, title in tables]
+
+
+def extract_schedule_tables(pdf_file, page_numbers=None, workers=1):
+    """Yields (page_num, DataFrame, title) for the schedule tables of a scanned document, in page order.
+
+    The document is opened once (once per worker process with workers > 1) and pages are rendered, checked
+    for a table structure and OCR'd in memory; nothing is written to disk. page_numbers defaults to every page.
+    Results are produced as pages complete, a caller that stops iterating stops the extraction.
+    """
+    with pymupdf.open(pdf_file) as document:
+        if page_numbers is None:
+            page_numbers = range(document.page_count)
+        page_numbers = list(page_numbers)
+
+        if workers <= 1 or len(page_numbers) <= 1:
+            for page_num in page_numbers:
+                for table, title in page_schedule_tables(document.load_page(page_num), page_num):
+                    yield page_num, table, title
+            return
+
+    chunks = [page_numbers[start:start + SCHEDULE_CHUNK_PAGES]
+              for start in range(0, len(page_numbers), SCHEDULE_CHUNK_PAGES)]
+    yield from iter_pool_results(_extract_schedule_chunk, chunks, workers, _init_schedule_worker, (pdf_file,))
+
+
+# Per-process state of a schedule extraction worker, set up once by _init_schedule_worker
+_worker_document = None
+
+
+def _init_schedule_worker(pdf_file):
+    global _worker_document
+    # Tesseract runs one process per page already, its own threads would only compete with the other workers
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    _worker_document = pymupdf.open(pdf_file)
+
+
+def _extract_schedule_chunk(page_numbers):
+    # The worker processes already keep every core busy, cell batches are OCR'd one at a time
+    return [(page_num, table, title) for page_num in page_numbers
+            for table, title in page_schedule_tables(_worker_document.load_page(page_num), page_num, threads=1)]
 
 
 # Example usage
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     pdf_file = "example.pdf"
-    page_num = 0
 
     if not os.path.exists(pdf_file):
         logging.error(f"PDF file '{pdf_file}' does not exist.")
     else:
-        extracted_tables, table_titles = process_image_based_page(pdf_file, page_num)
-        for title, table in zip(table_titles, extracted_tables):
+        for page_num, table, title in extract_schedule_tables(pdf_file):
             print(f"{title}\n{table}\n")
@@ -1,10 +1,14 @@
 import camelot
+import functools
 import logging
-import re
+import pymupdf
+from collections import defaultdict
+from output_writer import page_runs
+from schedule_extraction import contains_schedule_title, iter_pool_results
 
-
-def contains_schedule_title(text):
-    return re.search(r'schedule', text, re.IGNORECASE) is not None
+# Candidate pages handed to one camelot.read_pdf call; every call re-parses the PDF, so fewer, larger batches are
+# cheaper, while smaller ones let a worker pool share the pages out more evenly
+CAMELOT_BATCH_PAGES = 16
 
 
 def process_text_based_page(pdf_file, page_num):
@@ -16,14 +20,80 @@ def process_text_based_page(pdf_file, page_num):
         for table_num, table in enumerate(tables):
             table_text = table.df.to_string(index=False)
             if contains_schedule_title(table_text):
-                logging.info(f"Page {page_num + 1} is text-based and contains a schedule table.")
-                logging.info(f"Extracted table {table_num + 1} from Page {page_num + 1}:\n{table.df}")
+                # The table itself is only rendered into the log at DEBUG
+                logging.debug("Extracted table %d from Page %d:\n%s", table_num + 1, page_num + 1, table.df)
                 print(f"Extracted table {table_num + 1} from Page {page_num + 1}:\n{table.df}\n")
                 extracted_tables.append(table.df)
                 table_titles.append(f"Table {table_num + 1} on Page {page_num + 1}")
-            else:
-                logging.info(f"Page {page_num + 1} contains text but does not have a schedule table.")
+        logging.info("Page %d is text-based, %d of its %d tables are schedules", page_num + 1, len(extracted_tables),
+                     len(tables))
     else:
-        logging.info(f"Page {page_num + 1} is text-based but does not contain any tables.")
+        logging.info("Page %d is text-based but does not contain any tables.", page_num + 1)
 
     return extracted_tables, table_titles
+
+
+def schedule_candidate_pages(pdf_file, page_numbers=None):
+    """Returns the pages whose text layer mentions 'schedule' at all.
+
+    A schedule table's text is part of its page's text, so a page without the word cannot hold one and never
+    has to go through Camelot.
+    """
+    with pymupdf.open(pdf_file) as document:
+        if page_numbers is None:
+            page_numbers = range(document.page_count)
+        return [page_num for page_num in page_numbers
+                if contains_schedule_title(document.load_page(page_num).get_text())]
+
+
+def camelot_pages(page_numbers):
+    """Camelot's 1-based page list for sorted page numbers, e.g. [0, 1, 2, 6] -> '1-3,7'."""
+    return ','.join(str(first + 1) if first == last else f"{first + 1}-{last + 1}"
+                    for first, last in page_runs(page_numbers))
+
+
+def read_schedule_tables(pdf_file, page_numbers):
+    """Extracts the tables of all page_numbers with one camelot.read_pdf call.
+
+    Returns [(page_num, DataFrame, title)] for the tables with a schedule title, in page order.
+    """
+    tables_by_page = defaultdict(list)
+    for table in camelot.read_pdf(pdf_file, pages=camelot_pages(page_numbers)):
+        tables_by_page[int(table.page) - 1].append(table)
+
+    results = []
+    for page_num in page_numbers:
+        tables = tables_by_page.get(page_num, [])
+        schedules = [(page_num, table.df, f"Table {table_num + 1} on Page {page_num + 1}")
+                     for table_num, table in enumerate(tables)
+                     if contains_schedule_title(table.df.to_string(index=False))]
+        logging.info("Page %d is text-based, %d of its %d tables are schedules", page_num + 1, len(schedules),
+                     len(tables))
+        results.extend(schedules)
+    return results
+
+
+def extract_schedule_tables(pdf_file, page_numbers=None, workers=1, batch_pages=CAMELOT_BATCH_PAGES,
+                            prefilter=True):
+    """Yields (page_num, DataFrame, title) for the schedule tables of a text-based document, in page order.
+
+    Pages without 'schedule' in their text layer are skipped (unless prefilter is False, for pages already
+    checked by the caller); the rest go through Camelot batch_pages at a time, on a pool of worker processes
+    when workers > 1. page_numbers defaults to every page.
+    """
+    if page_numbers is None:
+        with pymupdf.open(pdf_file) as document:
+            page_numbers = range(document.page_count)
+    if prefilter:
+        candidates = schedule_candidate_pages(pdf_file, page_numbers)
+        logging.info("%d of the pages mention a schedule and go through table extraction", len(candidates))
+    else:
+        candidates = sorted(page_numbers)
+    batches = [candidates[start:start + batch_pages] for start in range(0, len(candidates), batch_pages)]
+
+    if workers <= 1 or len(batches) <= 1:
+        for batch in batches:
+            yield from read_schedule_tables(pdf_file, batch)
+        return
+
+    yield from iter_pool_results(functools.partial(read_schedule_tables, pdf_file), batches, workers)
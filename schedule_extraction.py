@@ -0,0 +1,23 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+
+def contains_schedule_title(text):
+    return re.search(r'schedule', text, re.IGNORECASE) is not None
+
+
+def iter_pool_results(function, tasks, workers, initializer=None, initargs=()):
+    """Runs function(task) for every task on a pool of up to workers processes and yields the items of the
+    lists it returns, in task order.
+
+    Results of a task are yielded while later tasks are still being worked on. A caller that stops iterating
+    shuts the pool down without waiting for the queued tasks.
+    """
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(tasks)), initializer=initializer, initargs=initargs)
+    try:
+        # map() returns results in task order
+        for results in executor.map(function, tasks):
+            yield from results
+    finally:
+        # Also reached when the caller stops iterating early, queued tasks are dropped instead of waited for
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,90 @@
+import logging
+import pymupdf
+from collections import Counter
+from schedule_extraction import contains_schedule_title
+
+# Routes a page can take through schedule extraction
+TEXT_ROUTE = "text"  # text layer mentions a schedule: Camelot on the vector content
+IMAGE_ROUTE = "image"  # no usable text layer, but a scan or outlined text: OpenCV + Tesseract on a render
+SKIP_ROUTE = "skip"  # text layer without any schedule, or an empty page: nothing to extract
+ROUTES = (TEXT_ROUTE, IMAGE_ROUTE, SKIP_ROUTE)
+
+# Fewer characters than this in the text layer means there is no usable text layer (stray labels, page numbers)
+MIN_TEXT_CHARS = 40
+# Share of the page covered by images from which a page without a usable text layer is treated as scanned
+MIN_IMAGE_COVERAGE = 0.5
+# Content stream size from which a page without text or images is treated as outlined text (fonts converted to
+# curves on export) that only OCR can read; blank and near-blank pages stay well below it
+MIN_VECTOR_BYTES = 20000
+
+
+def image_coverage(page):
+    """Share of the page area covered by placed images, overlapping images are not merged."""
+    page_area = abs(page.rect)
+    if not page_area:
+        return 0.0
+    covered = sum(abs(pymupdf.Rect(info["bbox"]) & page.rect) for info in page.get_image_info())
+    return min(1.0, covered / page_area)
+
+
+def route_page(page):
+    """Returns the route of a page, from its text layer, image coverage and vector content size.
+
+    Nothing is rendered; this takes a few milliseconds even on dense drawings.
+    """
+    text = page.get_text()
+    if contains_schedule_title(text):
+        return TEXT_ROUTE
+    if len(text.strip()) >= MIN_TEXT_CHARS:
+        # A real text layer (including the OCR layer of a searchable scan) that never mentions a schedule
+        return SKIP_ROUTE
+    if image_coverage(page) >= MIN_IMAGE_COVERAGE:
+        return IMAGE_ROUTE
+    if len(page.read_contents()) >= MIN_VECTOR_BYTES:
+        return IMAGE_ROUTE
+    return SKIP_ROUTE
+
+
+def route_pages(pdf_file, page_numbers=None):
+    """Returns {route: [page_num, ...]} for the pages of pdf_file (every page by default), each list sorted."""
+    routes = {route: [] for route in ROUTES}
+    with pymupdf.open(pdf_file) as document:
+        if page_numbers is None:
+            page_numbers = range(document.page_count)
+        for page_num in sorted(page_numbers):
+            routes[route_page(document.load_page(page_num))].append(page_num)
+    return routes
+
+
+class ScheduleExtractionJob:
+    """Extracts the schedule tables of a whole document, sending every page to the cheapest extractor that can
+    read it.
+
+    Iterating the job yields (page_num, DataFrame, title): the text-routed pages first, then the image-routed
+    ones, each in page order. route_counts tells how many pages took each route.
+    """
+
+    def __init__(self, pdf_file, page_numbers=None, workers=1):
+        self.pdf_file = pdf_file
+        self.workers = workers
+        self.routes = route_pages(pdf_file, page_numbers)
+        self.route_counts = Counter({route: len(pages) for route, pages in self.routes.items()})
+        logging.info("%s: pages routed to %s", pdf_file, dict(self.route_counts))
+
+    def __iter__(self):
+        # The extractors are imported on first use, a document routed entirely to one of them does not need the
+        # other's dependencies (Camelot, Tesseract)
+        if self.routes[TEXT_ROUTE]:
+            from pdf_processing_text import extract_schedule_tables as extract_text_tables
+            # The router already checked the text layer, the extractor's own prefilter would only repeat it
+            yield from extract_text_tables(self.pdf_file, self.routes[TEXT_ROUTE], workers=self.workers,
+                                           prefilter=False)
+        if self.routes[IMAGE_ROUTE]:
+            from pdf_processing_image import extract_schedule_tables as extract_image_tables
+            yield from extract_image_tables(self.pdf_file, self.routes[IMAGE_ROUTE], workers=self.workers)
+
+
+def extract_document_schedules(pdf_file, page_numbers=None, workers=1):
+    """Runs a ScheduleExtractionJob to completion, returns ([(page_num, DataFrame, title)], route counts)."""
+    job = ScheduleExtractionJob(pdf_file, page_numbers, workers)
+    return list(job), job.route_counts
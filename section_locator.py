@@ -0,0 +1,154 @@
+import logging
+
+# Positions returned by the classify callback, relative to the section being located
+BEFORE = -1
+INSIDE = 0
+AFTER = 1
+
+# How many pages on each side of an unreadable page are probed before giving up on that spot
+NEIGHBOR_PROBES = 2
+
+
+class SectionLocator:
+    """Finds the contiguous run of pages belonging to one section of a document ordered by section number.
+
+    classify(page_num) returns BEFORE, INSIDE or AFTER for a readable page and None for a page whose
+    section number could not be read. Results are memoized and every call to classify is counted in
+    probes, so the cost of a search can be reported. known_positions seeds the memo with results of an
+    earlier, interrupted search (see checkpoints), those pages are not probed again.
+    """
+
+    def __init__(self, total_pages, classify, progress_callback=None, neighbor_probes=NEIGHBOR_PROBES,
+                 known_positions=None):
+        self.total_pages = total_pages
+        self._classify = classify
+        self.progress_callback = progress_callback
+        self.neighbor_probes = neighbor_probes
+        self.progress = 0
+        self.probes = 0
+        self.positions = dict(known_positions or {})
+
+    def classify(self, page_num):
+        if page_num not in self.positions:
+            self.probes += 1
+            self.positions[page_num] = self._classify(page_num)
+            # Every probe is an OCR call, report (unchanged) progress so a cancel is noticed between probes
+            if self.progress_callback:
+                self.progress_callback(self.progress)
+        return self.positions[page_num]
+
+    def classify_near(self, page_num, low, high):
+        """Classifies page_num, or the nearest readable page within [low, high] if it is unreadable.
+
+        Returns (page, position), or (None, None) when the whole neighborhood is unreadable.
+        """
+        for offset in range(self.neighbor_probes + 1):
+            for candidate in (page_num - offset, page_num + offset) if offset else (page_num,):
+                if low <= candidate <= high:
+                    position = self.classify(candidate)
+                    if position is not None:
+                        return candidate, position
+        return None, None
+
+    def find_inside_page(self):
+        """Binary search for any page inside the section, returns None when the section is not found."""
+        intervals = [(0, self.total_pages - 1)]
+        while intervals:
+            low, high = intervals.pop()
+            if low > high:
+                continue
+            mid = (low + high) // 2
+            page, position = self.classify_near(mid, low, high)
+            logging.info("Section search -> Low: %d, High: %d, Mid: %d, Page: %s, Position: %s", low, high, mid, page,
+                         position)
+
+            if position == INSIDE:
+                return page
+            if position == BEFORE:
+                intervals.append((page + 1, high))
+            elif position == AFTER:
+                intervals.append((low, page - 1))
+            else:
+                # Nothing readable around mid, the section can be on either side of it
+                intervals.append((mid + self.neighbor_probes + 1, high))
+                intervals.append((low, mid - self.neighbor_probes - 1))
+        return None
+
+    def find_boundary(self, inside_page, direction):
+        """Gallops from inside_page in direction (-1 up, +1 down) to the first readable page outside the section.
+
+        Returns (last_inside, outside) where outside is None when the section runs to the end of the document.
+        """
+        outside_position = BEFORE if direction < 0 else AFTER
+        last_inside = inside_page
+        outside = None
+
+        # Exponential steps until a page outside the section is seen
+        step = 1
+        while True:
+            candidate = last_inside + direction * step
+            if not 0 <= candidate < self.total_pages:
+                candidate = 0 if direction < 0 else self.total_pages - 1
+                if candidate == last_inside:
+                    return last_inside, None
+            low, high = sorted((last_inside + direction, candidate))
+            page, position = self.classify_near(candidate, low, high)
+            if position is None and candidate in (0, self.total_pages - 1):
+                # Unreadable at the end of the document, walk back towards the section for a readable page
+                page = self._walk(candidate, last_inside, -direction)
+                if page is None:
+                    return last_inside, None
+                position = self.positions[page]
+            if position == outside_position:
+                outside = page
+                break
+            if position == INSIDE:
+                last_inside = page
+            step *= 2
+
+        # Binary search between the last page seen inside and the first page seen outside
+        while abs(outside - last_inside) > 1:
+            mid = (last_inside + outside) // 2
+            low, high = sorted((last_inside + direction, outside - direction))
+            page, position = self.classify_near(mid, low, high)
+            if position == INSIDE:
+                last_inside = page
+            elif position == outside_position:
+                outside = page
+            else:
+                # Unreadable stretch, walk it from the inside until something readable turns up
+                page = self._walk(last_inside + direction, outside, direction)
+                if page is None:
+                    break
+                if self.positions[page] == INSIDE:
+                    last_inside = page
+                else:
+                    outside = page
+        return last_inside, outside
+
+    def _walk(self, start, stop, direction):
+        for page_num in range(start, stop, direction):
+            if self.classify(page_num) is not None:
+                return page_num
+        return None
+
+    def locate(self):
+        """Returns (first_index, last_index) of the pages to extract, or None when the section is not found.
+
+        As before, the nearest readable page before and after the section is included in the range.
+        """
+        inside_page = self.find_inside_page()
+        if inside_page is None:
+            return None
+        logging.info("Section page found at index %d after %d probes", inside_page, self.probes)
+
+        self.progress = 33
+        first_inside, before = self.find_boundary(inside_page, -1)
+        self.progress = 66
+        last_inside, after = self.find_boundary(inside_page, 1)
+
+        first_index = before if before is not None else first_inside
+        last_index = after if after is not None else last_inside
+        logging.info("Section spans pages %d-%d, extracting %d-%d. %d probes over %d pages", first_inside, last_inside,
+                     first_index, last_index, self.probes, self.total_pages)
+        return first_index, last_index
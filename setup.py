@@ -4,6 +4,22 @@ setup(
     name='BruckerCo',
     version='1.0',
     packages=find_packages(),
+    # The project is a set of top-level modules, these are the ones the pdf-analyser command line needs
+    py_modules=[
+        'pdf_analyser',
+        'pdf_processing',
+        'checkpoints',
+        'debug_crops',
+        'instrumentation',
+        'layout_probe',
+        'logging_config',
+        'ocr_backends',
+        'ocr_cache',
+        'ocr_engine',
+        'output_writer',
+        'page_index',
+        'section_locator',
+    ],
     install_requires=[
         'pdfplumber~=0.11.1',
         'pandas~=2.2.2',
@@ -25,6 +41,7 @@ setup(
     entry_points={
         'console_scripts': [
             'bruckercopy = BruckerCo:main',
+            'pdf-analyser = pdf_analyser:main',
         ],
     },
 )
@@ -0,0 +1,26 @@
+import itertools
+import os
+import random
+import sys
+import tempfile
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+
+# pdf_processing creates its folders under the Desktop on import, keep them out of the real one
+_home = tempfile.mkdtemp(prefix="pdf_analyser_tests_")
+os.environ["HOME"] = _home
+os.environ["USERPROFILE"] = _home
+
+# Randomized checks run RANDOM_CASES cases for each of RANDOM_SEEDS seeds, a failure is reproducible from its seed
+RANDOM_SEEDS = 4
+RANDOM_CASES = 2000
+
+
+@pytest.fixture(params=range(RANDOM_SEEDS))
+def random_cases(request):
+    """The seeded random.Random of a randomized check, once per case."""
+    return itertools.repeat(random.Random(request.param), RANDOM_CASES)
@@ -0,0 +1,84 @@
+import pytest
+
+import pdf_processing
+from layout_probe import LAYOUT_PADDING, LAYOUT_TOLERANCE, corner_offsets, probe_layout
+from ocr_cache import OcrResultCache
+from synthetic_sets import make_plan_set
+
+PAGE_SIZES = [(2592, 1728), (3456, 2592), (612, 792)]
+
+
+def random_pages(rng):
+    """(page_width, page_height, token box) or None per page, the token near the bottom-right corner."""
+    jitter = rng.choice((0, 10, LAYOUT_TOLERANCE, 3 * LAYOUT_TOLERANCE))
+    missing = rng.choice((0.0, 0.3, 0.8))
+    pages = []
+    for _ in range(rng.randint(1, 15)):
+        if rng.random() < missing:
+            pages.append(None)
+            continue
+        width, height = rng.choice(PAGE_SIZES)
+        x0 = width - 200 + rng.uniform(-jitter, jitter)
+        y0 = height - 80 + rng.uniform(-jitter, jitter)
+        pages.append((width, height, (x0, y0, x0 + rng.uniform(40, 120), y0 + rng.uniform(8, 30))))
+    return pages
+
+
+def linear_scan(pages, probe_pages, max_pages):
+    """Reference result of probe_layout and the pages it has to read, from every page's token."""
+    found = [page_num for page_num in range(min(len(pages), max_pages)) if pages[page_num]][:probe_pages]
+    read = max_pages if len(found) < probe_pages else found[-1] + 1
+    read = min(read, len(pages))
+    if not found or len(found) < min(probe_pages, len(pages)):
+        return None, read
+    offsets = [corner_offsets(*pages[page_num]) for page_num in found]
+    for edge in range(4):
+        values = [offset[edge] for offset in offsets]
+        if max(values) - min(values) > LAYOUT_TOLERANCE:
+            return None, read
+    return (max(offset[0] for offset in offsets) + LAYOUT_PADDING,
+            max(offset[1] for offset in offsets) + LAYOUT_PADDING,
+            max(0.0, min(offset[2] for offset in offsets) - LAYOUT_PADDING),
+            max(0.0, min(offset[3] for offset in offsets) - LAYOUT_PADDING)), read
+
+
+def test_probe_layout_matches_linear_scan(random_cases):
+    for rng in random_cases:
+        pages = random_pages(rng)
+        probe_pages = rng.randint(1, 5)
+        max_pages = rng.randint(probe_pages, 10)
+        read = []
+
+        def find_token(page_num):
+            read.append(page_num)
+            return pages[page_num]
+
+        layout = probe_layout(len(pages), find_token, probe_pages, max_pages)
+        expected, pages_read = linear_scan(pages, probe_pages, max_pages)
+        assert layout == expected, pages
+        assert read == list(range(pages_read))
+
+
+class FakeReader:
+    """Reads the sheet number at the same spot of every probed region, counting the calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def readtext(self, image, detail):
+        self.calls += 1
+        return [([[900, 600], [1000, 600], [1000, 630], [900, 630]], "M-101", 0.9)]
+
+
+def test_probe_ocr_is_cached(tmp_path, monkeypatch):
+    reader = FakeReader()
+    monkeypatch.setattr(pdf_processing, "get_easyocr_reader", lambda: reader)
+    monkeypatch.setattr(pdf_processing, "ocr_cache", OcrResultCache(str(tmp_path / "ocr_cache.sqlite")))
+    monkeypatch.setattr(pdf_processing, "OCR_CACHE_ENABLED", True)
+    document = make_plan_set(3, scanned_every=1)
+
+    layout = pdf_processing.detect_title_block_layout(document, "PLANS", "easyocr")
+    assert layout is not None and reader.calls == 3
+    # A re-run of the same set gets the probe's lines from the cache
+    assert pdf_processing.detect_title_block_layout(document, "PLANS", "easyocr") == layout
+    assert reader.calls == 3
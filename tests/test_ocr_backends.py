@@ -0,0 +1,20 @@
+import pdf_processing
+from ocr_backends import TESSERACT_CONFIG, TESSERACT_SPARSE_CONFIG, get_ocr_backend
+from synthetic_sets import make_plan_set
+
+
+def attempt_configs(layout):
+    page = make_plan_set(1, scanned_every=1)[0]
+    box = pdf_processing.title_block_box(page, "PLANS")
+    attempts = pdf_processing.ocr_attempts(page, box, "PLANS", layout, [get_ocr_backend("tesseract")])
+    return [(ocr_box == box, backend.config) for ocr_box, _, backend in attempts]
+
+
+def test_default_box_is_read_as_sparse_text():
+    assert set(attempt_configs(None)) == {(True, TESSERACT_SPARSE_CONFIG)}
+
+
+def test_only_the_tight_box_is_read_as_one_line():
+    configs = attempt_configs((320.0, 90.0, 100.0, 40.0))
+    assert configs[:-1] == [(False, TESSERACT_CONFIG)] * (len(configs) - 1)
+    assert configs[-1] == (True, TESSERACT_SPARSE_CONFIG)
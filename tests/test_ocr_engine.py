@@ -0,0 +1,39 @@
+import multiprocessing
+import sys
+import time
+import types
+
+import pytest
+
+import ocr_engine
+
+
+class SlowReader:
+    def __init__(self, languages, gpu):
+        time.sleep(1)
+
+
+def load_reader():
+    ocr_engine.get_easyocr_reader()
+
+
+@pytest.fixture
+def slow_easyocr(monkeypatch):
+    monkeypatch.setitem(sys.modules, "easyocr", types.SimpleNamespace(Reader=SlowReader))
+    monkeypatch.setattr(ocr_engine, "_easyocr_reader", None)
+    monkeypatch.setattr(ocr_engine, "_prewarm_thread", None)
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+@pytest.mark.parametrize("wait", [False, True])
+def test_worker_forked_during_prewarm_loads_reader(slow_easyocr, wait):
+    ocr_engine.prewarm_ocr_engine()
+    if wait:
+        ocr_engine.wait_for_prewarm("fork")
+    worker = multiprocessing.get_context("fork").Process(target=load_reader)
+    worker.start()
+    worker.join(10)
+    if worker.is_alive():
+        worker.kill()
+        pytest.fail("forked worker hangs on the OCR engine lock")
+    assert worker.exitcode == 0
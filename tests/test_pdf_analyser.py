@@ -0,0 +1,21 @@
+import os
+
+from pdf_analyser import expand_inputs
+
+
+def make_pdfs(root, *paths):
+    for path in paths:
+        os.makedirs(os.path.dirname(root / path), exist_ok=True)
+        (root / path).write_bytes(b"%PDF-1.7")
+
+
+def test_earlier_outputs_below_the_input_are_skipped(tmp_path):
+    make_pdfs(tmp_path, "jobs/set1.pdf", "jobs/a/set2.pdf", "jobs/filtered/set1.pdf", "jobs/filtered/a/set2.pdf")
+    jobs = str(tmp_path / "jobs")
+    output_folder = os.path.join(jobs, "filtered")
+    expected = [(os.path.join(jobs, "set1.pdf"), "."), (os.path.join(jobs, "a", "set2.pdf"), "a")]
+
+    assert sorted(expand_inputs([jobs], output_folder)) == sorted(expected)
+    assert len(expand_inputs([os.path.join(jobs, "**", "*.pdf")], output_folder)) == 2
+    # Inputs given inside the output folder are still read
+    assert len(expand_inputs([output_folder], output_folder)) == 2
@@ -0,0 +1,56 @@
+import os
+
+import pymupdf
+import pytest
+
+import pdf_processing
+from output_writer import partial_output_path
+from synthetic_sets import make_plan_set, plan_sheet_number
+
+PAGES = 20
+
+
+class Cancelled(Exception):
+    pass
+
+
+@pytest.fixture
+def plan_set(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_processing, "CHECKPOINTS_FOLDER", str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(pdf_processing, "FINGERPRINTS_FOLDER", str(tmp_path / "fingerprints"))
+    monkeypatch.setattr(pdf_processing, "OCR_CACHE_ENABLED", False)
+    monkeypatch.setattr(pdf_processing, "METRICS_SUMMARY_ENABLED", False)
+    monkeypatch.setattr(pdf_processing, "PARTIAL_OUTPUT_ENABLED", True)
+    path = tmp_path / "plans.pdf"
+    make_plan_set(PAGES, scanned_every=0).save(path)
+    output_folder = tmp_path / "output"
+    output_folder.mkdir()
+    return str(path), str(output_folder)
+
+
+def cancel_at(percent):
+    def progress_callback(progress):
+        if progress >= percent:
+            raise Cancelled()
+    return progress_callback
+
+
+def test_cancelled_run_resumes(plan_set):
+    path, output_folder = plan_set
+    with pytest.raises(Cancelled):
+        pdf_processing.create_filtered_pdf(path, "PLANS", cancel_at(40), batch_size=4, output_folder=output_folder,
+                                           ocr_mode="text_layer")
+    output_path = os.path.join(output_folder, "plans.pdf")
+    assert os.path.exists(partial_output_path(output_path))
+    assert os.listdir(pdf_processing.CHECKPOINTS_FOLDER)
+
+    assert pdf_processing.create_filtered_pdf(path, "PLANS", batch_size=4, output_folder=output_folder,
+                                              ocr_mode="text_layer") == output_path
+    expected = [page_num for page_num in range(PAGES) if plan_sheet_number(page_num).startswith("M")]
+    with pymupdf.open(output_path) as output:
+        assert output.page_count == len(expected)
+        assert [page.get_text() for page in output] == [page.get_text() for page in pymupdf.open(path)
+                                                         if page.number in expected]
+    # Both the journal and the partial output are gone once the extraction completed
+    assert not os.listdir(pdf_processing.CHECKPOINTS_FOLDER)
+    assert not os.path.exists(partial_output_path(output_path))
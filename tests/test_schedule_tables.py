@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+
+import pdf_processing_image
+from synthetic_sets import make_schedule_pages
+
+ROWS = 12
+
+
+@pytest.fixture
+def no_tesseract(monkeypatch):
+    # Only the table structure is checked, the OCR of titles and cells is stubbed out
+    monkeypatch.setattr(pdf_processing_image, "ocr_image", lambda image: "MECHANICAL EQUIPMENT SCHEDULE")
+    monkeypatch.setattr(pdf_processing_image, "ocr_words",
+                        lambda image: pd.DataFrame(columns=["text", "left", "top", "width", "height", "conf"]))
+
+
+@pytest.mark.parametrize("scanned", [False, True])
+def test_table_has_a_row_per_table_row(no_tesseract, scanned):
+    page = make_schedule_pages(1, scanned=scanned, rows=ROWS)[0]
+    tables = pdf_processing_image.page_schedule_tables(page, 0, threads=1)
+    assert [table.shape for table, _ in tables] == [(ROWS + 1, 6)]
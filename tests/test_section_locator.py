@@ -0,0 +1,40 @@
+from section_locator import AFTER, BEFORE, INSIDE, SectionLocator
+
+
+def random_positions(rng):
+    """Positions of a random document: BEFORE, INSIDE and AFTER runs, some pages unreadable (None)."""
+    total_pages = rng.randint(1, 80)
+    if rng.random() < 0.1:
+        # Section missing from the document
+        split = rng.randint(0, total_pages)
+        positions = [BEFORE] * split + [AFTER] * (total_pages - split)
+    else:
+        first = rng.randrange(total_pages)
+        last = rng.randint(first, min(total_pages - 1, first + rng.choice((0, 2, 10, total_pages))))
+        positions = [BEFORE] * first + [INSIDE] * (last - first + 1) + [AFTER] * (total_pages - last - 1)
+    unreadable = rng.choice((0.0, 0.1, 0.3, 0.6, 0.9))
+    return [None if rng.random() < unreadable else position for position in positions]
+
+
+def linear_scan(positions):
+    """Reference result of SectionLocator.locate, reading every page."""
+    inside = [page_num for page_num, position in enumerate(positions) if position == INSIDE]
+    if not inside:
+        return None
+    readable = [page_num for page_num, position in enumerate(positions) if position is not None]
+    before = [page_num for page_num in readable if page_num < inside[0]]
+    after = [page_num for page_num in readable if page_num > inside[-1]]
+    return before[-1] if before else inside[0], after[0] if after else inside[-1]
+
+
+def test_locate_matches_linear_scan(random_cases):
+    for rng in random_cases:
+        positions = random_positions(rng)
+        # Half the searches resume from an interrupted one that had already classified some pages
+        known = {}
+        if rng.random() < 0.5:
+            known = {page_num: positions[page_num] for page_num in range(len(positions)) if rng.random() < 0.2}
+        locator = SectionLocator(len(positions), positions.__getitem__, known_positions=known,
+                                 neighbor_probes=rng.randint(0, 3))
+        assert locator.locate() == linear_scan(positions), positions
+        assert locator.probes <= len(positions) - len(known)